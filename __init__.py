@@ -1,4 +1,11 @@
-from .data_structures import Note, Chord, PianoRoll, MusicalSegment, NoteType
+from .data_structures import (
+    Note,
+    NoteArrays,
+    Chord,
+    PianoRoll,
+    MusicalSegment,
+    NoteType,
+)
 
 from .midi_parser import MidiParser, MidiParserError, load_midi
 
@@ -27,6 +34,7 @@ from .difficulty_adjuster import (
 __all__ = [
     # Data structures
     "Note",
+    "NoteArrays",
     "Chord",
     "PianoRoll",
     "MusicalSegment",
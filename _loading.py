@@ -0,0 +1,41 @@
+"""
+Cached MIDI loading shared by the AutoScribe test scripts.
+"""
+
+import copy
+import os
+from functools import lru_cache
+
+from autoscribe import MidiParser, PianoRoll, load_midi
+
+
+@lru_cache(maxsize=32)
+def _cached_load(midi_path, mtime_ns, size):
+    """Parse a MIDI file once per (path, modification time, size)"""
+    return load_midi(midi_path)
+
+
+def load_cached(midi_path):
+    """
+    Load a MIDI file, reusing the parse while the file is unchanged.
+
+    Args:
+        midi_path: Path to MIDI file
+
+    Returns:
+        PianoRoll owned by the caller (a copy of the cached parse)
+
+    Raises:
+        MidiParserError: If the file is missing, not a MIDI file or unreadable
+    """
+    path = os.path.abspath(midi_path)
+    MidiParser.validate_path(path)
+    st = os.stat(path)
+    parsed = _cached_load(path, st.st_mtime_ns, st.st_size)
+    # Callers may edit the roll or its notes; keep the cached parse intact
+    return PianoRoll(
+        notes=[copy.copy(note) for note in parsed.notes],
+        tempo=parsed.tempo,
+        time_signature=parsed.time_signature,
+        key_signature=parsed.key_signature,
+    )
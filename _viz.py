@@ -0,0 +1,240 @@
+"""
+Shared plotting helpers for the AutoScribe test scripts.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from autoscribe.core import _numba
+from autoscribe.core._numba import njit
+
+# Above this many notes, piano rolls are drawn as an image, not as polygons
+RASTER_THRESHOLD = 5000
+
+
+@lru_cache(maxsize=None)
+def _alpha_lut(alpha_base, alpha_span):
+    """Alpha for every MIDI velocity: alpha_base + alpha_span * velocity/127"""
+    lut = np.arange(128, dtype=np.float32) * np.float32(alpha_span / 127.0)
+    lut += np.float32(alpha_base)
+    lut.flags.writeable = False
+    return lut
+
+
+@njit(cache=True)
+def _mask_notes(starts, pitches, durations, velocities, max_duration, alpha_lut):
+    """Keep notes starting before max_duration and look up their alphas"""
+    mask = starts < max_duration
+    return starts[mask], pitches[mask], durations[mask], alpha_lut[velocities[mask]]
+
+
+def _visible_count(piano_roll, max_duration):
+    """Number of leading notes starting before max_duration (notes sorted by start)"""
+    return np.searchsorted(piano_roll.arrays.starts, max_duration, side="left")
+
+
+def visible_pitch_range(piano_rolls, max_duration):
+    """
+    Lowest and highest pitch among the notes that start before max_duration.
+
+    Args:
+        piano_rolls: PianoRolls to look at together
+        max_duration: Only notes starting before this time count
+
+    Returns:
+        (lowest, highest), or None if no note is visible
+    """
+    lowest, highest = [], []
+    for piano_roll in piano_rolls:
+        arrays = piano_roll.arrays
+        if piano_roll.starts_sorted:
+            pitches = arrays.pitches[:_visible_count(piano_roll, max_duration)]
+        else:
+            pitches = arrays.pitches[arrays.starts < max_duration]
+        if pitches.size:
+            lowest.append(pitches.min())
+            highest.append(pitches.max())
+    if not lowest:
+        return None
+    return int(min(lowest)), int(max(highest))
+
+
+def _visible_notes(piano_roll, max_duration, alpha_range):
+    """(starts, pitches, durations, alphas) of the notes starting before max_duration"""
+    arrays = piano_roll.arrays
+    alpha_lut = _alpha_lut(*alpha_range)
+    if not piano_roll.starts_sorted:
+        return _mask_notes(
+            arrays.starts, arrays.pitches, arrays.durations, arrays.velocities,
+            max_duration, alpha_lut
+        )
+    # Time-ordered notes: the visible ones are a prefix
+    k = _visible_count(piano_roll, max_duration)
+    return (
+        arrays.starts[:k], arrays.pitches[:k], arrays.durations[:k],
+        alpha_lut[arrays.velocities[:k]]
+    )
+
+
+def note_collection(piano_roll, max_duration, facecolor, edgecolor="black",
+                    alpha=None, alpha_range=(0.3, 0.6), clip=False,
+                    linewidth=0.5, label=None):
+    """
+    Build a single PolyCollection with one rectangle per visible note.
+
+    Args:
+        piano_roll: PianoRoll to draw
+        max_duration: Only notes starting before this time are drawn
+        facecolor: Rectangle fill color
+        edgecolor: Rectangle edge color
+        alpha: Fixed alpha, or None to scale alpha with note velocity
+        alpha_range: (base, span) of the velocity alpha, base + span * velocity/127
+        clip: Cut rectangles off at max_duration
+        linewidth: Rectangle edge width
+        label: Legend label for the whole collection, dropped if no note is visible
+
+    Returns:
+        PolyCollection ready for ax.add_collection
+    """
+    from matplotlib.collections import PolyCollection
+
+    starts, pitches, durations, alphas = _visible_notes(
+        piano_roll, max_duration, alpha_range
+    )
+    if clip:
+        durations = np.minimum(durations, max_duration - starts)
+    ends = starts + durations
+    tops = pitches + 0.8
+    verts = np.stack([
+        np.column_stack([starts, pitches]),
+        np.column_stack([ends, pitches]),
+        np.column_stack([ends, tops]),
+        np.column_stack([starts, tops]),
+    ], axis=1)
+    # Matplotlib rejects an empty alpha array
+    if alpha is None and len(alphas):
+        alpha = alphas
+    if not len(starts):
+        label = None
+    return PolyCollection(
+        verts, facecolors=facecolor, edgecolors=edgecolor,
+        alpha=alpha, linewidths=linewidth, label=label
+    )
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _fill_notes(image, starts, durations, rows, alphas, rgb, px_per_sec,
+                note_height, order, bounds):
+    """
+    Paint one filled rectangle per note into an (H, W, 4) RGBA image.
+
+    order lists the notes grouped by pitch row, group g spanning
+    order[bounds[g]:bounds[g + 1]]. Rows are painted in parallel (they cover
+    disjoint pixels); notes within a row in their original order, so
+    overlapping notes resolve the same way on every run.
+    """
+    height, width = image.shape[0], image.shape[1]
+    for g in _numba.prange(bounds.shape[0] - 1):
+        for k in range(bounds[g], bounds[g + 1]):
+            i = order[k]
+            x0 = int(starts[i] * px_per_sec)
+            x1 = min(width, max(x0 + 1, int((starts[i] + durations[i]) * px_per_sec)))
+            y0 = rows[i]
+            y1 = min(height, y0 + note_height)
+            for c in range(3):
+                image[y0:y1, x0:x1, c] = rgb[c]
+            image[y0:y1, x0:x1, 3] = alphas[i]
+
+
+def note_image(piano_roll, max_duration, pitch_range, color,
+               alpha_range=(0.3, 0.6), width=2000, px_per_pitch=5):
+    """
+    Rasterize the visible notes into an RGBA image for ax.imshow.
+
+    Rectangles match note_collection (0.8 semitones tall, velocity alpha,
+    cut off at max_duration) but carry no edge lines.
+
+    Args:
+        piano_roll: PianoRoll to draw
+        max_duration: Only notes starting before this time are drawn
+        pitch_range: (lowest, highest) pitch; one semitone of margin is added
+        color: Rectangle fill color
+        alpha_range: (base, span) of the velocity alpha, base + span * velocity/127
+        width: Image width in pixels
+        px_per_pitch: Image rows per semitone
+
+    Returns:
+        (image, extent) for ax.imshow(image, origin="lower", extent=extent)
+    """
+    from matplotlib.colors import to_rgb
+
+    lowest, highest = pitch_range[0] - 1, pitch_range[1] + 1
+    image = np.zeros(((highest - lowest) * px_per_pitch, width, 4), dtype=np.uint8)
+
+    starts, pitches, durations, alphas = _visible_notes(
+        piano_roll, max_duration, alpha_range
+    )
+    rows = (pitches.astype(np.int64) - lowest) * px_per_pitch
+    rgb = (np.array(to_rgb(color)) * 255).astype(np.uint8)
+    # Group notes by row, keeping their order within each row
+    order = np.argsort(rows, kind="stable")
+    bounds = np.concatenate((
+        [0], np.flatnonzero(np.diff(rows[order])) + 1, [len(rows)]
+    )).astype(np.int64)
+    _fill_notes(
+        image, starts, durations, rows, (alphas * 255).astype(np.uint8), rgb,
+        width / max_duration, int(0.8 * px_per_pitch), order, bounds
+    )
+    return image, (0, max_duration, lowest, highest)
+
+
+def draw_notes(ax, piano_roll, max_duration, facecolor, edgecolor="black",
+               alpha_range=(0.3, 0.6), pitch_range=None, clip=False, label=None):
+    """
+    Draw the visible notes on ax, as an image for dense rolls.
+
+    Rolls with more than RASTER_THRESHOLD notes are painted with note_image,
+    smaller ones are added as a note_collection.
+
+    Args:
+        ax: Axes to draw on
+        piano_roll: PianoRoll to draw
+        max_duration: Only notes starting before this time are drawn
+        facecolor: Rectangle fill color
+        edgecolor: Rectangle edge color (collections only)
+        alpha_range: (base, span) of the velocity alpha, base + span * velocity/127
+        pitch_range: (lowest, highest) pitch covered by the image, shared by
+            rolls drawn on the same axes; defaults to the roll's visible range
+        clip: Cut rectangles off at max_duration (images always are)
+        label: Legend label
+
+    Returns:
+        Legend handle for label, or None if unlabelled or no note is visible
+    """
+    if len(piano_roll.notes) <= RASTER_THRESHOLD:
+        collection = note_collection(
+            piano_roll, max_duration, facecolor, edgecolor,
+            alpha_range=alpha_range, clip=clip, label=label
+        )
+        ax.add_collection(collection)
+        if label is None or not collection.get_paths():
+            return None
+        return collection
+
+    from matplotlib.patches import Patch
+
+    visible_range = visible_pitch_range([piano_roll], max_duration)
+    if visible_range is None:
+        return None
+    image, extent = note_image(
+        piano_roll, max_duration, pitch_range or visible_range, facecolor,
+        alpha_range=alpha_range
+    )
+    ax.imshow(
+        image, origin="lower", extent=extent, aspect="auto",
+        interpolation="nearest"
+    )
+    if label is None:
+        return None
+    return Patch(facecolor=facecolor, edgecolor=edgecolor, label=label)
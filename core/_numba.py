@@ -0,0 +1,49 @@
+"""
+Optional Numba support.
+Numeric kernels are decorated with njit; numba is imported and the kernel
+compiled on its first call, so importing a module with kernels stays cheap.
+Without numba installed they run as plain Python/NumPy functions.
+"""
+
+import functools
+import importlib.util
+
+# Checked without importing numba itself
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+
+# Plain range until the first kernel is compiled, then numba.prange.
+# Kernels must refer to it as _numba.prange (not import the name) so numba
+# resolves the module attribute when it compiles them.
+prange = range
+
+
+class _LazyKernel:
+    """Function wrapper that compiles with numba.njit on first call"""
+
+    def __init__(self, func, options):
+        self._func = func
+        self._options = options
+        self._kernel = None
+        functools.update_wrapper(self, func)
+
+    def __call__(self, *args, **kwargs):
+        if self._kernel is None:
+            self._kernel = self._compile()
+        return self._kernel(*args, **kwargs)
+
+    def _compile(self):
+        if not NUMBA_AVAILABLE:
+            return self._func
+
+        global prange
+        import numba
+
+        prange = numba.prange
+        return numba.njit(**self._options)(self._func)
+
+
+def njit(*args, **kwargs):
+    """Lazy numba.njit, usable with or without arguments"""
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return _LazyKernel(args[0], {})
+    return lambda func: _LazyKernel(func, kwargs)
@@ -4,9 +4,11 @@ All other modules build on these fundamental classes.
 """
 
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple
 from enum import Enum
 
+import numpy as np
+
 
 class NoteType(Enum):
     """Classification of note types for analysis"""
@@ -111,6 +113,72 @@ class Chord:
         return f"Chord(notes={pitches}, start={self.start:.3f}s)"
 
 
+class NoteArrays(NamedTuple):
+    """
+    Struct-of-arrays view of a note list, one entry per note in order.
+
+    Attributes:
+        starts: Start times in seconds (float64)
+        ends: End times in seconds (float64)
+        durations: Durations in seconds (float64)
+        pitches: MIDI pitches (int16)
+        velocities: Velocities (int16)
+    """
+
+    starts: np.ndarray
+    ends: np.ndarray
+    durations: np.ndarray
+    pitches: np.ndarray
+    velocities: np.ndarray
+
+    @classmethod
+    def from_notes(cls, notes: List[Note]) -> "NoteArrays":
+        """Build read-only arrays from a list of notes"""
+        count = len(notes)
+        starts = np.fromiter((n.start for n in notes), dtype=np.float64, count=count)
+        ends = np.fromiter((n.end for n in notes), dtype=np.float64, count=count)
+        pitches = np.fromiter((n.pitch for n in notes), dtype=np.int16, count=count)
+        velocities = np.fromiter(
+            (n.velocity for n in notes), dtype=np.int16, count=count
+        )
+        arrays = cls(starts, ends, ends - starts, pitches, velocities)
+        for array in arrays:
+            array.flags.writeable = False
+        return arrays
+
+
+class _NoteList(list):
+    """
+    Note list that counts its in-place modifications.
+
+    PianoRoll keys its memo on this count, so appending, removing, replacing
+    or reordering notes through any list operation drops cached values.
+    """
+
+    # Class default so unpickling, which extends the list before restoring
+    # instance attributes, can still count
+    version = 0
+
+
+def _counting(method):
+    """Wrap a mutating list method to bump _NoteList.version"""
+
+    def wrapper(self, *args, **kwargs):
+        self.version += 1
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = method.__name__
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+for _name in (
+    "__setitem__", "__delitem__", "__iadd__", "__imul__", "append", "extend",
+    "insert", "pop", "remove", "clear", "sort", "reverse",
+):
+    setattr(_NoteList, _name, _counting(getattr(list, _name)))
+
+
 @dataclass
 class PianoRoll:
     """
@@ -129,6 +197,21 @@ class PianoRoll:
     time_signature: Tuple[int, int] = (4, 4)
     key_signature: int = 0  # 0 = C major, positive = sharps, negative = flats,
 
+    # Memoized values derived from the notes, see cached()
+    _cache: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    _cache_key: Optional[Tuple[int, int]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __setattr__(self, name: str, value: Any):
+        # Keep notes in a _NoteList so in-place edits are seen by cached()
+        if name == "notes":
+            if not isinstance(value, _NoteList):
+                value = _NoteList(value)
+            if "_cache" in self.__dict__:
+                self.invalidate()
+        super().__setattr__(name, value)
+
     def __post_init__(self):
         """Validate and sort notes"""
         if self.tempo <= 0:
@@ -137,10 +220,86 @@ class PianoRoll:
             raise ValueError(f"Invalid time signature: {self.time_signature}")
         self.sort_by_time()
 
+    @classmethod
+    def from_arrays(
+        cls, starts, durations, pitches, velocities, **kwargs
+    ) -> "PianoRoll":
+        """
+        Build a PianoRoll from parallel note attribute arrays.
+
+        Args:
+            starts: Start times in seconds
+            durations: Durations in seconds
+            pitches: MIDI pitches
+            velocities: Note velocities
+            **kwargs: Remaining PianoRoll fields (tempo, time_signature, ...)
+
+        Returns:
+            PianoRoll with one Note per array entry
+        """
+        starts = np.asarray(starts, dtype=np.float64)
+        ends = starts + np.asarray(durations, dtype=np.float64)
+        notes = [
+            Note(pitch=pitch, start=start, end=end, velocity=velocity)
+            for start, end, pitch, velocity in zip(
+                starts.tolist(),
+                ends.tolist(),
+                np.asarray(pitches).tolist(),
+                np.asarray(velocities).tolist(),
+            )
+        ]
+        return cls(notes=notes, **kwargs)
+
     def sort_by_time(self):
         """Sort notes chronologically, then by pitch"""
         self.notes.sort(key=lambda n: (n.start, n.pitch))
 
+    def cached(self, name: str, compute: Callable[[], Any]) -> Any:
+        """
+        Memoize a value derived from the notes.
+
+        Cached values are dropped whenever the note list is replaced or
+        modified in place. Call invalidate() after changing attributes of
+        individual notes, which cannot be detected.
+
+        Args:
+            name: Cache slot name
+            compute: Zero-argument function producing the value
+
+        Returns:
+            The cached or freshly computed value
+        """
+        if not isinstance(self.notes, _NoteList):
+            # Bypassed __setattr__, e.g. restored from an older pickle
+            self.notes = self.notes
+        key = (id(self.notes), self.notes.version)
+        if key != self._cache_key:
+            self._cache.clear()
+            self._cache_key = key
+        if name not in self._cache:
+            self._cache[name] = compute()
+        return self._cache[name]
+
+    def invalidate(self):
+        """Drop all values memoized by cached()"""
+        self._cache.clear()
+        self._cache_key = None
+
+    @property
+    def arrays(self) -> NoteArrays:
+        """Note attributes as parallel NumPy arrays (cached until notes change)"""
+        return self.cached("arrays", lambda: NoteArrays.from_notes(self.notes))
+
+    @property
+    def starts_sorted(self) -> bool:
+        """Whether note start times are non-decreasing (cached until notes change)"""
+
+        def compute():
+            starts = self.arrays.starts
+            return bool(np.all(starts[1:] >= starts[:-1]))
+
+        return self.cached("starts_sorted", compute)
+
     def get_notes_at_time(self, time: float, tolerance: float = 0.01) -> List[Note]:
         """
         Get all notes starting at approximately the same time.
@@ -156,20 +315,30 @@ class PianoRoll:
 
     def get_notes_in_range(self, start_time: float, end_time: float) -> List[Note]:
         """Get all notes that start within a time range"""
-        return [n for n in self.notes if start_time <= n.start < end_time]
+        if not self.starts_sorted:
+            # Notes were appended out of order since the last sort
+            return [n for n in self.notes if start_time <= n.start < end_time]
+
+        first, last = np.searchsorted(
+            self.arrays.starts, [start_time, end_time], side="left"
+        )
+        return self.notes[first:last]
 
     def get_duration(self) -> float:
         """Total duration of the piano roll in seconds"""
         if not self.notes:
             return 0.0
-        return max(n.end for n in self.notes)
+        return float(self.arrays.ends.max())
 
     def get_pitch_range(self) -> Tuple[int, int]:
         """Get minimum and maximum pitches used"""
         if not self.notes:
             return (0, 0)
-        pitches = [n.pitch for n in self.notes]
-        return (min(pitches), max(pitches))
+        return self.cached("pitch_range", self._compute_pitch_range)
+
+    def _compute_pitch_range(self) -> Tuple[int, int]:
+        pitches = self.arrays.pitches
+        return (int(pitches.min()), int(pitches.max()))
 
     def filter_by_pitch_range(self, min_pitch: int, max_pitch: int) -> "PianoRoll":
         """Create new PianoRoll with only notes in specified pitch range"""
@@ -186,19 +355,21 @@ class PianoRoll:
         if not self.notes:
             return {"note_count": 0}
 
-        pitches = [n.pitch for n in self.notes]
-        durations = [n.duration for n in self.notes]
-        velocities = [n.velocity for n in self.notes]
+        # Note-derived values are cached; tempo and meter may be reassigned
+        stats = dict(self.cached("statistics", self._compute_note_statistics))
+        stats["tempo"] = self.tempo
+        stats["time_signature"] = self.time_signature
+        return stats
 
+    def _compute_note_statistics(self) -> dict:
+        arrays = self.arrays
         return {
             "note_count": len(self.notes),
             "duration": self.get_duration(),
             "pitch_range": self.get_pitch_range(),
-            "avg_pitch": sum(pitches) / len(pitches),
-            "avg_duration": sum(durations) / len(durations),
-            "avg_velocity": sum(velocities) / len(velocities),
-            "tempo": self.tempo,
-            "time_signature": self.time_signature,
+            "avg_pitch": float(arrays.pitches.mean()),
+            "avg_duration": float(arrays.durations.mean()),
+            "avg_velocity": float(arrays.velocities.mean()),
         }
 
     def __repr__(self) -> str:
@@ -4,7 +4,8 @@ from dataclasses import dataclass
 from enum import Enum
 
 from .data_structures import Note, PianoRoll, Chord
-from .chord_detector import ChordDetector
+from .chord_detector import ChordDetector, ChordDetectionConfig
+from ._numba import NUMBA_AVAILABLE, njit
 
 
 class DifficultyLevel(Enum):
@@ -42,6 +43,62 @@ class DifficultyConfig:
     max_hand_stretch: int = 7  # Semitones for beginners
 
 
+@dataclass(frozen=True)
+class _DifficultyMetrics:
+    """Level-independent measurements of a piano roll"""
+
+    notes_per_second: float
+    max_simultaneous_notes: int
+    max_hand_stretch: int
+
+
+@njit(cache=True, fastmath=True)
+def _chord_metrics(starts, pitches, threshold, min_chord_size):
+    """
+    Largest chord size and widest chord span, grouping notes by onset.
+    
+    Mirrors ChordDetector's grouping: each note joins the first existing
+    group whose onset is within threshold, otherwise it starts a new one.
+    Only groups of at least min_chord_size notes count as chords.
+    
+    Returns:
+        (max_simultaneous_notes, max_hand_stretch); (1, 0) without chords
+    """
+    n = len(starts)
+    onsets = np.empty(n, dtype=np.float64)
+    counts = np.zeros(n, dtype=np.int64)
+    lowest = np.empty(n, dtype=np.int64)
+    highest = np.empty(n, dtype=np.int64)
+    n_groups = 0
+    
+    for i in range(n):
+        group = n_groups
+        for g in range(n_groups):
+            if abs(starts[i] - onsets[g]) <= threshold:
+                group = g
+                break
+        
+        pitch = pitches[i]
+        if group == n_groups:
+            onsets[group] = starts[i]
+            lowest[group] = pitch
+            highest[group] = pitch
+            n_groups += 1
+        else:
+            lowest[group] = min(lowest[group], pitch)
+            highest[group] = max(highest[group], pitch)
+        counts[group] += 1
+    
+    max_simultaneous = 1
+    max_stretch = 0
+    for g in range(n_groups):
+        if counts[g] >= min_chord_size:
+            max_simultaneous = max(max_simultaneous, counts[g])
+            max_stretch = max(max_stretch, highest[g] - lowest[g])
+    
+    return max_simultaneous, max_stretch
+
+
 class DifficultyAdjuster:
     """
     Adjusts piano music difficulty to target level.
@@ -98,6 +155,16 @@ class DifficultyAdjuster:
         self.config = config or DifficultyConfig()
         self.params = self.LEVEL_PARAMS[self.config.target_level]
 
+    def set_level(self, target_level: DifficultyLevel):
+        """
+        Change the target difficulty level.
+
+        Args:
+            target_level: New target level
+        """
+        self.config.target_level = target_level
+        self.params = self.LEVEL_PARAMS[target_level]
+
     def adjust_difficulty(self, piano_roll: PianoRoll) -> PianoRoll:
         """
         Adjust piano roll to target difficulty level.
@@ -153,14 +220,10 @@ class DifficultyAdjuster:
             return DifficultyLevel.BEGINNER
         
         # Calculate metrics
-        duration = piano_roll.get_duration()
-        notes_per_second = len(piano_roll.notes) / duration if duration > 0 else 0
-        
-        # Check simultaneous notes
-        max_simultaneous = self._get_max_simultaneous_notes(piano_roll)
-        
-        # Check hand stretches
-        max_stretch = self._get_max_hand_stretch(piano_roll)
+        metrics = self._measure(piano_roll)
+        notes_per_second = metrics.notes_per_second
+        max_simultaneous = metrics.max_simultaneous_notes
+        max_stretch = metrics.max_hand_stretch
         
         # Score based on metrics
         scores = []
@@ -185,32 +248,54 @@ class DifficultyAdjuster:
         best_level = max(scores, key=lambda x: x[1])[0]
         return best_level
     
-    def _get_max_simultaneous_notes(self, piano_roll: PianoRoll) -> int:
-        """Get maximum number of simultaneous notes"""
-        detector = ChordDetector()
-        chords = detector.detect_chords(piano_roll)
+    def _measure(self, piano_roll: PianoRoll) -> _DifficultyMetrics:
+        """
+        Get level-independent difficulty metrics.
         
-        if not chords:
-            return 1
+        The result is cached on the piano roll, so analyzing the same roll
+        for several target levels measures it only once.
         
-        return max(len(chord.notes) for chord in chords)
+        Args:
+            piano_roll: Piano roll to measure
+            
+        Returns:
+            Difficulty metrics
+        """
+        return piano_roll.cached(
+            "difficulty_metrics", lambda: self._compute_metrics(piano_roll)
+        )
     
-    def _get_max_hand_stretch(self, piano_roll: PianoRoll) -> int:
-        """Get maximum hand stretch required"""
-        detector = ChordDetector()
-        chords = detector.detect_chords(piano_roll)
+    def _compute_metrics(self, piano_roll: PianoRoll) -> _DifficultyMetrics:
+        """Measure note density, chord size and hand stretch"""
+        duration = piano_roll.get_duration()
+        notes_per_second = len(piano_roll.notes) / duration if duration > 0 else 0
         
-        if not chords:
-            return 0
+        # Roots are not needed for size and stretch
+        chord_config = ChordDetectionConfig(analyze_chord_types=False)
         
-        max_stretch = 0
-        for chord in chords:
-            if len(chord.notes) >= 2:
-                pitches = [n.pitch for n in chord.notes]
-                stretch = max(pitches) - min(pitches)
-                max_stretch = max(max_stretch, stretch)
+        if NUMBA_AVAILABLE:
+            # One compiled pass over the note arrays, using the same grouping
+            # rules as ChordDetector
+            arrays = piano_roll.arrays
+            max_simultaneous, max_stretch = _chord_metrics(
+                arrays.starts, arrays.pitches,
+                chord_config.simultaneity_threshold, chord_config.min_chord_size
+            )
+        else:
+            # The kernel's scalar loops are slower than ChordDetector when
+            # run as plain Python
+            chords = ChordDetector(chord_config).detect_chords(piano_roll)
+            max_simultaneous = max((len(c.notes) for c in chords), default=1)
+            max_stretch = max(
+                (c.notes[-1].pitch - c.notes[0].pitch for c in chords), default=0
+            )
         
-        return max_stretch
+        return _DifficultyMetrics(
+            notes_per_second=notes_per_second,
+            max_simultaneous_notes=int(max_simultaneous),
+            max_hand_stretch=int(max_stretch),
+        )
+    
     def _simplify(self, piano_roll: PianoRoll) -> PianoRoll:
         """
         Simplify piano roll for lower difficulty.
@@ -355,13 +440,13 @@ class DifficultyAdjuster:
             processed_times.add(chord.start)
         
         # Add any notes that weren't part of chords
-        for note in notes:
+        for note in temp_roll.notes:
             if not any(abs(note.start - t) < 0.05 for t in processed_times):
                 simplified_notes.append(note)
         
         return simplified_notes
 
-def _reduce_stretches(self, notes: List[Note]) -> List[Note]:
+    def _reduce_stretches(self, notes: List[Note]) -> List[Note]:
         """Reduce hand stretches by moving notes or removing them"""
         detector = ChordDetector()
         temp_roll = PianoRoll(notes=notes, tempo=120)
@@ -393,7 +478,7 @@ def _reduce_stretches(self, notes: List[Note]) -> List[Note]:
             processed_times.add(chord.start)
         
         # Add single notes
-        for note in notes:
+        for note in temp_roll.notes:
             if not any(abs(note.start - t) < 0.05 for t in processed_times):
                 adjusted_notes.append(note)
         
@@ -457,36 +542,33 @@ def _reduce_stretches(self, notes: List[Note]) -> List[Note]:
         Returns:
             Dictionary with difficulty metrics
         """
-        duration = piano_roll.get_duration()
-        notes_per_second = len(piano_roll.notes) / duration if duration > 0 else 0
-        max_simultaneous = self._get_max_simultaneous_notes(piano_roll)
-        max_stretch = self._get_max_hand_stretch(piano_roll)
+        metrics = self._measure(piano_roll)
         current_level = self._analyze_difficulty(piano_roll)
         
         return {
             'difficulty_level': current_level.value,
-            'notes_per_second': notes_per_second,
-            'max_simultaneous_notes': max_simultaneous,
-            'max_hand_stretch': max_stretch,
+            'notes_per_second': metrics.notes_per_second,
+            'max_simultaneous_notes': metrics.max_simultaneous_notes,
+            'max_hand_stretch': metrics.max_hand_stretch,
             'tempo': piano_roll.tempo,
             'total_notes': len(piano_roll.notes),
-            'duration': duration,
+            'duration': piano_roll.get_duration(),
         }
 
 
-    def adjust_difficulty(piano_roll: PianoRoll, 
-                         target_level: DifficultyLevel) -> PianoRoll:
-        """
-        Convenience function to adjust difficulty.
+def adjust_difficulty(piano_roll: PianoRoll, 
+                      target_level: DifficultyLevel) -> PianoRoll:
+    """
+    Convenience function to adjust difficulty.
+    
+    Args:
+        piano_roll: Piano roll to adjust
+        target_level: Target difficulty level
         
-        Args:
-            piano_roll: Piano roll to adjust
-            target_level: Target difficulty level
-            
-        Returns:
-            Adjusted piano roll
-        """
-        config = DifficultyConfig(target_level=target_level)
-        adjuster = DifficultyAdjuster(config)
-        return adjuster.adjust_difficulty(piano_roll)
+    Returns:
+        Adjusted piano roll
+    """
+    config = DifficultyConfig(target_level=target_level)
+    adjuster = DifficultyAdjuster(config)
+    return adjuster.adjust_difficulty(piano_roll)
 
@@ -3,14 +3,25 @@ MIDI Parser Module
 Handles loading and parsing MIDI files into our internal representation.
 """
 
+import io
+import mmap
 import os
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import BinaryIO, List, Tuple, Optional, Union
+import numpy as np
 import pretty_midi
 import warnings
 
+try:
+    import symusic
+except ImportError:  # Optional; only used with MidiParser(use_symusic=True)
+    symusic = None
+
 from .data_structures import Note, PianoRoll
 
+# A path to a MIDI file, its raw bytes, or a binary file object
+MidiSource = Union[str, os.PathLike, bytes, bytearray, memoryview, mmap.mmap, BinaryIO]
+
 
 class MidiParserError(Exception):
     """Custom exception for MIDI parsing errors"""
@@ -32,24 +43,36 @@ class MidiParser:
     # Supported file extensions
     SUPPORTED_EXTENSIONS = [".mid", ".midi"]
 
-    def __init__(self, strict_piano_range: bool = False, merge_tracks: bool = True):
+    def __init__(
+        self,
+        strict_piano_range: bool = False,
+        merge_tracks: bool = True,
+        use_symusic: bool = False,
+    ):
         """
         Initialize MIDI parser.
 
         Args:
             strict_piano_range: If True, reject files with notes outside piano range
             merge_tracks: If True, combine all non-drum tracks into one
+            use_symusic: If True and symusic is installed, parse with it instead
+                of pretty_midi. Faster, but overlapping notes on the same pitch
+                are paired differently (symusic matches note-offs first in,
+                first out; pretty_midi ends every open note at the first
+                note-off), so results can differ on such files
         """
         self.strict_piano_range = strict_piano_range
         self.merge_tracks = merge_tracks
+        self.use_symusic = use_symusic
         self.warnings_list = []
 
-    def load(self, midi_path: str) -> PianoRoll:
+    def load(self, midi_source: MidiSource) -> PianoRoll:
         """
         Load MIDI file and convert to PianoRoll.
 
         Args:
-            midi_path: Path to MIDI file
+            midi_source: Path to MIDI file, or its contents as bytes, a
+                memoryview, an mmap or a binary file object
 
         Returns:
             PianoRoll object containing all musical data
@@ -60,17 +83,80 @@ class MidiParser:
         # Reset warnings
         self.warnings_list = []
 
-        # Validate file path
-        self._validate_path(midi_path)
+        # Validate file path (in-memory data has no path to check)
+        if isinstance(midi_source, (str, os.PathLike)):
+            midi_source = os.fspath(midi_source)
+            self.validate_path(midi_source)
 
         # Load MIDI file
+        if self.use_symusic and symusic is not None:
+            piano_roll = self._load_symusic(midi_source)
+        else:
+            piano_roll = self._load_pretty_midi(midi_source)
+
+        # Log statistics
+        self._log_statistics(piano_roll)
+
+        return piano_roll
+
+    def _load_symusic(self, midi_source: MidiSource) -> PianoRoll:
+        """Parse with symusic, reading notes straight into NumPy arrays"""
+        try:
+            if isinstance(midi_source, str):
+                score = symusic.Score(midi_source, ttype="second")
+            else:
+                score = symusic.Score.from_midi(
+                    self._read_bytes(midi_source), ttype="second"
+                )
+        except Exception as e:
+            raise MidiParserError(f"Failed to load MIDI file: {e}")
+
+        # Validate content
+        self._validate_midi_content(score.tracks)
+
+        # Extract notes
+        columns = [track.notes.numpy() for track in score.tracks if not track.is_drum]
+        starts, durations, pitches, velocities = (
+            np.concatenate([c[key] for c in columns]).astype(dtype)
+            for key, dtype in (
+                ("time", np.float64),
+                ("duration", np.float64),
+                ("pitch", np.int16),
+                ("velocity", np.int16),
+            )
+        )
+        valid = self._validate_note_arrays(starts, durations, pitches, velocities)
+
+        # Tonic pitch class from the circle of fifths, minor keys offset by 12
+        # to match pretty_midi's key numbering
+        key_numbers = [
+            (ks.key * 7 + 9 * ks.tonality) % 12 + 12 * ks.tonality
+            for ks in score.key_signatures
+        ]
+
+        return PianoRoll.from_arrays(
+            starts[valid],
+            durations[valid],
+            pitches[valid],
+            velocities[valid],
+            tempo=self._select_tempo([t.qpm for t in score.tempos]),
+            time_signature=self._select_time_signature(
+                [(ts.numerator, ts.denominator) for ts in score.time_signatures]
+            ),
+            key_signature=self._select_key_signature(key_numbers),
+        )
+
+    def _load_pretty_midi(self, midi_source: MidiSource) -> PianoRoll:
+        """Parse with pretty_midi (the default backend)"""
+        if isinstance(midi_source, (bytes, bytearray, memoryview)):
+            midi_source = io.BytesIO(midi_source)
         try:
-            midi_data = pretty_midi.PrettyMIDI(midi_path)
+            midi_data = pretty_midi.PrettyMIDI(midi_source)
         except Exception as e:
             raise MidiParserError(f"Failed to load MIDI file: {e}")
 
         # Validate content
-        self._validate_midi_content(midi_data)
+        self._validate_midi_content(midi_data.instruments)
 
         # Extract notes
         notes = self._extract_notes(midi_data)
@@ -84,40 +170,59 @@ class MidiParser:
         # Extract key signature (use first, or default to C major)
         key_signature = self._extract_key_signature(midi_data)
 
-        # Create PianoRoll
-        piano_roll = PianoRoll(
+        return PianoRoll(
             notes=notes,
             tempo=tempo,
             time_signature=time_signature,
             key_signature=key_signature,
         )
 
-        # Log statistics
-        self._log_statistics(piano_roll)
+    @staticmethod
+    def _read_bytes(midi_source: MidiSource) -> bytes:
+        """
+        Raw MIDI bytes from an in-memory buffer or a binary file object.
 
-        return piano_roll
+        symusic's Score.from_midi only accepts bytes, so other buffers are
+        copied; paths are read by symusic directly and never come here.
+        """
+        if isinstance(midi_source, bytes):
+            return midi_source
+        if isinstance(midi_source, (bytearray, memoryview, mmap.mmap)):
+            return bytes(midi_source)
+        return midi_source.read()
+
+    @classmethod
+    def validate_path(cls, path: str):
+        """
+        Validate file exists and has correct extension.
 
-    def _validate_path(self, path: str):
-        """Validate file exists and has correct extension"""
+        Raises:
+            MidiParserError: If the file is missing or not a MIDI file
+        """
         if not os.path.exists(path):
             raise MidiParserError(f"File not found: {path}")
 
         ext = Path(path).suffix.lower()
-        if ext not in self.SUPPORTED_EXTENSIONS:
+        if ext not in cls.SUPPORTED_EXTENSIONS:
             raise MidiParserError(
                 f"Unsupported file extension: {ext}. "
-                f"Supported: {', '.join(self.SUPPORTED_EXTENSIONS)}"
+                f"Supported: {', '.join(cls.SUPPORTED_EXTENSIONS)}"
             )
 
-    def _validate_midi_content(self, midi: pretty_midi.PrettyMIDI):
-        """Validate MIDI has appropriate content for piano transcription"""
+    def _validate_midi_content(self, instruments):
+        """
+        Validate MIDI has appropriate content for piano transcription.
+
+        Args:
+            instruments: pretty_midi instruments or symusic tracks
+        """
 
         # Check for instruments
-        if not midi.instruments:
+        if not instruments:
             raise MidiParserError("MIDI file contains no instruments")
 
         # Check for non-drum instruments
-        non_drum_instruments = [i for i in midi.instruments if not i.is_drum]
+        non_drum_instruments = [i for i in instruments if not i.is_drum]
         if not non_drum_instruments:
             raise MidiParserError("MIDI file contains only drum tracks")
 
@@ -176,19 +281,63 @@ class MidiParser:
                     continue
 
         return notes
-    
+
+    def _validate_note_arrays(
+        self,
+        starts: np.ndarray,
+        durations: np.ndarray,
+        pitches: np.ndarray,
+        velocities: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Vectorized counterpart of the checks in _extract_notes.
+
+        Returns:
+            Boolean mask of the notes to keep
+        """
+        outside = (pitches < self.PIANO_MIN_PITCH) | (pitches > self.PIANO_MAX_PITCH)
+        if outside.any():
+            if self.strict_piano_range:
+                raise MidiParserError(
+                    f"Note pitch {pitches[outside][0]} outside piano range "
+                    f"({self.PIANO_MIN_PITCH}-{self.PIANO_MAX_PITCH})"
+                )
+            for pitch in pitches[outside].tolist():
+                self._add_warning(f"Note pitch {pitch} outside standard piano range")
+
+        valid = (
+            (starts >= 0)
+            & (durations > 0)
+            & (pitches >= 0) & (pitches <= 127)
+            & (velocities >= 0) & (velocities <= 127)
+        )
+        for i in np.flatnonzero(~valid).tolist():
+            # Let Note produce the same message the per-note path reports
+            try:
+                Note(
+                    pitch=int(pitches[i]),
+                    start=float(starts[i]),
+                    end=float(starts[i] + durations[i]),
+                    velocity=int(velocities[i]),
+                )
+            except ValueError as e:
+                self._add_warning(f"Skipping invalid note: {e}")
+        return valid
+
     def _extract_tempo(self, midi: pretty_midi.PrettyMIDI) -> float:
         """Extract tempo from MIDI file"""
-        tempo_changes = midi.get_tempo_changes()
+        return self._select_tempo(midi.get_tempo_changes()[1].tolist())
 
-        if len(tempo_changes[1]) > 0:
+    def _select_tempo(self, tempos: List[float]) -> float:
+        """Pick the first tempo, or default to 120 BPM"""
+        if len(tempos) > 0:
             # Use first tempo
-            tempo = float(tempo_changes[1][0])
+            tempo = float(tempos[0])
 
             # Warn if multiple tempo changes
-            if len(tempo_changes[1]) > 1:
+            if len(tempos) > 1:
                 self._add_warning(
-                    f"MIDI contains {len(tempo_changes[1])} tempo changes. "
+                    f"MIDI contains {len(tempos)} tempo changes. "
                     f"Using first tempo: {tempo:.1f} BPM"
                 )
 
@@ -201,12 +350,17 @@ class MidiParser:
 
     def _extract_time_signature(self, midi: pretty_midi.PrettyMIDI) -> Tuple[int, int]:
         """Extract time signature from MIDI file"""
-        time_signatures = midi.time_signature_changes
+        return self._select_time_signature(
+            [(ts.numerator, ts.denominator) for ts in midi.time_signature_changes]
+        )
 
+    def _select_time_signature(
+        self, time_signatures: List[Tuple[int, int]]
+    ) -> Tuple[int, int]:
+        """Pick the first time signature, or default to 4/4"""
         if time_signatures:
             # Use first time signature
-            ts = time_signatures[0]
-            time_sig = (ts.numerator, ts.denominator)
+            time_sig = time_signatures[0]
 
             # Warn if multiple time signatures
             if len(time_signatures) > 1:
@@ -224,11 +378,15 @@ class MidiParser:
 
     def _extract_key_signature(self, midi: pretty_midi.PrettyMIDI) -> int:
         """Extract key signature from MIDI file"""
-        key_signatures = midi.key_signature_changes
+        return self._select_key_signature(
+            [ks.key_number for ks in midi.key_signature_changes]
+        )
 
+    def _select_key_signature(self, key_signatures: List[int]) -> int:
+        """Pick the first key signature, or default to C major"""
         if key_signatures:
             # Use first key signature
-            key_sig = key_signatures[0].key_number
+            key_sig = key_signatures[0]
 
             # Warn if multiple key signatures
             if len(key_signatures) > 1:
@@ -279,12 +437,13 @@ class MidiParser:
         return self.warnings_list.copy()
 
 
-def load_midi(path: str, **kwargs) -> PianoRoll:
+def load_midi(path: MidiSource, **kwargs) -> PianoRoll:
     """
     Convenience function to load a MIDI file.
 
     Args:
-        path: Path to MIDI file
+        path: Path to MIDI file, or its contents as bytes, a memoryview,
+            an mmap or a binary file object
         **kwargs: Additional arguments passed to MidiParser
 
     Returns:
@@ -46,6 +46,8 @@ class MusicXMLExporter:
         self.auto_separate_voices = auto_separate_voices
         self.auto_assign_hands = auto_assign_hands
         self.difficulty_level = difficulty_level
+        # Size in bytes of the most recently written file
+        self.last_file_size: Optional[int] = None
     
     def export(self, 
                piano_roll: PianoRoll, 
@@ -94,7 +96,7 @@ class MusicXMLExporter:
         if self.difficulty_level:
             print(f"Adjusting difficulty to {self.difficulty_level.value}...")
             adjuster = DifficultyAdjuster()
-            adjuster.config.target_level = self.difficulty_level
+            adjuster.set_level(self.difficulty_level)
             piano_roll = adjuster.adjust_difficulty(piano_roll)
             print(f" Difficulty adjusted")
         
@@ -341,10 +343,13 @@ class MusicXMLExporter:
         
         print(f"Wrote MusicXML to: {output_path}")
         
-        # Check file was created
-        if os.path.exists(output_path):
-            file_size = os.path.getsize(output_path)
-            print(f" File size: {file_size:,} bytes")
+        # Check file was created (one stat; the size is kept for callers)
+        try:
+            self.last_file_size = os.stat(output_path).st_size
+        except OSError:
+            self.last_file_size = None
+        else:
+            print(f" File size: {self.last_file_size:,} bytes")
         
         return output_path
     
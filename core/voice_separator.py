@@ -1,9 +1,23 @@
 import numpy as np
-from typing import List, Tuple, Optional, Dict
+from typing import List, Tuple, Optional
 from dataclasses import dataclass
-from collections import defaultdict
 
 from .data_structures import Note, PianoRoll, NoteType
+from ._numba import NUMBA_AVAILABLE, njit
+
+
+@njit(cache=True)
+def _contour_kernel(times, starts, ends, pitches):
+    """Highest pitch sounding on each frame (start <= time < end)"""
+    contour = np.zeros(times.shape[0])
+    first = np.searchsorted(times, starts)
+    last = np.searchsorted(times, ends)
+    for i in range(starts.shape[0]):
+        pitch = pitches[i]
+        for frame in range(first[i], last[i]):
+            if pitch > contour[frame]:
+                contour[frame] = pitch
+    return contour
 
 
 @dataclass
@@ -39,6 +53,9 @@ class VoiceSeparator:
     - Bass: Bottom voice, bass line and left hand
     """
 
+    # Melody notes compared against the bass per step of crossing detection
+    CROSSING_BLOCK_SIZE = 1024
+
     def __init__(self, config: Optional[VoiceSeparationConfig] = None):
         """
         Initialize voice separator.
@@ -164,30 +181,35 @@ class VoiceSeparator:
             else:
                 return [], [self._mark_as(note, NoteType.HARMONY)], []
 
-        # Multiple notes - use sophisticated separation
-        sorted_by_pitch = sorted(notes, key=lambda n: n.pitch, reverse=True)
+        # Multiple notes - pick melody candidates and the bass note, with
+        # direct compares for the common two- and three-note windows
+        if len(notes) == 2:
+            melody_set, bass_idx = self._rank_pair(notes)
+        elif len(notes) == 3:
+            melody_set, bass_idx = self._rank_triple(notes)
+        else:
+            melody_set, bass_idx = self._rank_window(notes)
 
         melody = []
         harmony = []
         bass = []
 
-        # Highest note(s) are usually melody
-        melody_candidates = sorted_by_pitch[: self.config.max_melody_polyphony]
-
-        # If using velocity hints, prefer louder notes for melody
-        if self.config.use_velocity_hints:
-            melody_candidates = sorted(
-                melody_candidates, key=lambda n: n.velocity, reverse=True
-            )
-            melody_candidates = melody_candidates[: min(2, len(melody_candidates))]
-
-        bass_note = sorted_by_pitch[-1]
+        # Notes equal to a picked note share its role, as with the list
+        # membership tests this replaces
+        melody_notes = [notes[i] for i in melody_set]
+        melody_pitches = {note.pitch for note in melody_notes}
+        bass_note = notes[bass_idx]
 
         # Everything else is harmony
-        for note in notes:
-            if note in melody_candidates:
+        for i, note in enumerate(notes):
+            if i in melody_set or (
+                note.pitch in melody_pitches and note in melody_notes
+            ):
                 melody.append(self._mark_as(note, NoteType.MELODY))
-            elif note == bass_note and note.pitch <= self.config.bass_pitch_threshold:
+            elif (
+                i == bass_idx
+                or (note.pitch == bass_note.pitch and note == bass_note)
+            ) and note.pitch <= self.config.bass_pitch_threshold:
                 bass.append(self._mark_as(note, NoteType.BASS))
             else:
                 harmony.append(self._mark_as(note, NoteType.HARMONY))
@@ -199,6 +221,107 @@ class VoiceSeparator:
 
         return melody, harmony, bass
 
+    def _rank_pair(self, notes: List[Note]) -> Tuple[set, int]:
+        """
+        Fast path of _rank_window for exactly two notes.
+
+        Args:
+            notes: The two notes in the window
+
+        Returns:
+            Tuple of (melody note indices, bass note index)
+        """
+        # Rank keys pitch * 2 + (1 - index): the first note wins pitch ties
+        # for melody, the second is the bass on a tie
+        high = 1 if notes[1].pitch > notes[0].pitch else 0
+        polyphony = self.config.max_melody_polyphony
+
+        # Velocity hints keep two candidates, so they never drop one here
+        if polyphony >= 2:
+            return {0, 1}, 1 - high
+        if polyphony == 1:
+            return {high}, 1 - high
+        return set(), 1 - high
+
+    def _rank_triple(self, notes: List[Note]) -> Tuple[set, int]:
+        """
+        Fast path of _rank_window for exactly three notes.
+
+        Args:
+            notes: The three notes in the window
+
+        Returns:
+            Tuple of (melody note indices, bass note index)
+        """
+        # Same unique rank keys as _rank_window
+        keys = [note.pitch * 3 + (2 - i) for i, note in enumerate(notes)]
+        low = 0
+        if keys[1] < keys[low]:
+            low = 1
+        if keys[2] < keys[low]:
+            low = 2
+
+        polyphony = min(self.config.max_melody_polyphony, 3)
+        if polyphony <= 0:
+            return set(), low
+
+        if polyphony == 3:
+            if not self.config.use_velocity_hints:
+                return {0, 1, 2}, low
+            # Keep the two loudest of the three
+            quiet = min(range(3), key=lambda i: (notes[i].velocity, keys[i]))
+            return {0, 1, 2} - {quiet}, low
+
+        # Order indices by key, highest first, with three compare-swaps
+        order = [0, 1, 2]
+        if keys[order[0]] < keys[order[1]]:
+            order[0], order[1] = order[1], order[0]
+        if keys[order[1]] < keys[order[2]]:
+            order[1], order[2] = order[2], order[1]
+        if keys[order[0]] < keys[order[1]]:
+            order[0], order[1] = order[1], order[0]
+        return set(order[:polyphony]), low
+
+    def _rank_window(self, notes: List[Note]) -> Tuple[set, int]:
+        """
+        Pick melody candidates and the bass note in a time window.
+
+        Notes are ranked by pitch, highest first, with earlier notes ahead
+        on pitch ties. Melody takes the top max_melody_polyphony notes, of
+        which velocity hints keep the two loudest (rank breaking velocity
+        ties). The bass is the last note in that order.
+
+        Args:
+            notes: Notes in the time window (at least two)
+
+        Returns:
+            Tuple of (melody note indices, bass note index)
+        """
+        count = len(notes)
+        pitches = np.fromiter((n.pitch for n in notes), dtype=np.int64, count=count)
+        velocities = np.fromiter(
+            (n.velocity for n in notes), dtype=np.int64, count=count
+        )
+
+        # Fold the index into the key so every note has a distinct rank
+        keys = pitches * count + np.arange(count - 1, -1, -1)
+
+        # Highest note(s) are usually melody
+        polyphony = min(self.config.max_melody_polyphony, count)
+        if polyphony > 0:
+            melody_idx = np.argpartition(keys, count - polyphony)[count - polyphony :]
+        else:
+            melody_idx = np.empty(0, dtype=np.intp)
+
+        # If using velocity hints, prefer louder notes for melody
+        if self.config.use_velocity_hints and polyphony > 2:
+            velocity_keys = velocities[melody_idx] * (128 * count) + keys[melody_idx]
+            melody_idx = melody_idx[
+                np.argpartition(velocity_keys, polyphony - 2)[polyphony - 2 :]
+            ]
+
+        return set(melody_idx.tolist()), int(np.argmin(keys))
+
     def _mark_as(self, note: Note, note_type: NoteType) -> Note:
         """
         Create a copy of note with specified type.
@@ -229,9 +352,43 @@ class VoiceSeparator:
             Dictionary with voice statistics
         """
         melody, harmony, bass = self.separate_voices(piano_roll)
+        return self._voice_statistics(len(piano_roll.notes), melody, harmony, bass)
+
+    def summarize(
+        self,
+        piano_roll: PianoRoll,
+        melody: PianoRoll,
+        harmony: PianoRoll,
+        bass: PianoRoll,
+    ) -> dict:
+        """
+        Voice statistics and crossings for voices already separated from a roll.
 
-        total_notes = len(piano_roll.notes)
+        Combines analyze_voices and detect_voice_crossings without running
+        the separation again for each of them.
+
+        Args:
+            piano_roll: PianoRoll the voices were separated from
+            melody: Melody voice
+            harmony: Harmony voice
+            bass: Bass voice
 
+        Returns:
+            Dictionary with the analyze_voices statistics plus a "crossings"
+            list of detect_voice_crossings events
+        """
+        stats = self._voice_statistics(len(piano_roll.notes), melody, harmony, bass)
+        stats["crossings"] = self._find_crossings(melody, bass)
+        return stats
+
+    def _voice_statistics(
+        self,
+        total_notes: int,
+        melody: PianoRoll,
+        harmony: PianoRoll,
+        bass: PianoRoll,
+    ) -> dict:
+        """Note counts, shares, ranges and average pitches of each voice"""
         if total_notes == 0:
             return {
                 "total_notes": 0,
@@ -244,6 +401,10 @@ class VoiceSeparator:
         harmony_range = harmony.get_pitch_range() if harmony.notes else (0, 0)
         bass_range = bass.get_pitch_range() if bass.notes else (0, 0)
 
+        melody_avg = self._average_pitch(melody.notes)
+        harmony_avg = self._average_pitch(harmony.notes)
+        bass_avg = self._average_pitch(bass.notes)
+
         return {
             "total_notes": total_notes,
             "melody_notes": len(melody.notes),
@@ -255,17 +416,28 @@ class VoiceSeparator:
             "melody_range": melody_range,
             "harmony_range": harmony_range,
             "bass_range": bass_range,
-            "melody_avg_pitch": (
-                np.mean([n.pitch for n in melody.notes]) if melody.notes else 0
-            ),
-            "harmony_avg_pitch": (
-                np.mean([n.pitch for n in harmony.notes]) if harmony.notes else 0
-            ),
-            "bass_avg_pitch": (
-                np.mean([n.pitch for n in bass.notes]) if bass.notes else 0
-            ),
+            "melody_avg_pitch": melody_avg,
+            "harmony_avg_pitch": harmony_avg,
+            "bass_avg_pitch": bass_avg,
         }
 
+    def _average_pitch(self, notes: List[Note]) -> float:
+        """
+        Mean pitch of a voice, or 0 if it is empty.
+
+        Voices are usually small, where a plain sum beats np.mean's
+        array conversion overhead.
+
+        Args:
+            notes: Notes in the voice
+
+        Returns:
+            Average MIDI pitch
+        """
+        if not notes:
+            return 0
+        return sum(n.pitch for n in notes) / len(notes)
+
     def get_voice_contour(
         self, notes: List[Note], resolution: float = 0.25
     ) -> np.ndarray:
@@ -282,17 +454,29 @@ class VoiceSeparator:
         if not notes:
             return np.array([])
 
-        duration = max(n.end for n in notes)
-        num_frames = int(duration / resolution) + 1
+        count = len(notes)
+        starts = np.fromiter((n.start for n in notes), dtype=np.float64, count=count)
+        ends = np.fromiter((n.end for n in notes), dtype=np.float64, count=count)
+        pitches = np.fromiter((n.pitch for n in notes), dtype=np.float64, count=count)
+
+        num_frames = int(ends.max() / resolution) + 1
+        times = np.arange(num_frames) * resolution
+
+        if NUMBA_AVAILABLE:
+            return _contour_kernel(times, starts, ends, pitches)
+
         contour = np.zeros(num_frames)
 
-        for frame in range(num_frames):
-            time = frame * resolution
-            # Find active notes at this time
-            active = [n for n in notes if n.start <= time < n.end]
-            if active:
-                # Use highest pitch if multiple notes
-                contour[frame] = max(n.pitch for n in active)
+        # A note is active on frames with start <= time < end: a contiguous
+        # frame range per note, found by binary search on the frame times
+        first = np.searchsorted(times, starts, side="left")
+        lengths = np.searchsorted(times, ends, side="left") - first
+
+        # Scatter each note's pitch over its frames, keeping the highest
+        frames = np.arange(lengths.sum()) + np.repeat(
+            first - np.cumsum(lengths) + lengths, lengths
+        )
+        np.maximum.at(contour, frames, np.repeat(pitches, lengths))
 
         return contour
 
@@ -308,23 +492,36 @@ class VoiceSeparator:
             List of crossing events
         """
         melody, harmony, bass = self.separate_voices(piano_roll)
-        crossings = []
+        return self._find_crossings(melody, bass)
 
-        # Check melody-bass crossings
-        for m_note in melody.notes:
-            for b_note in bass.notes:
-                # Check if they overlap in time
-                if not (m_note.end <= b_note.start or b_note.end <= m_note.start):
-                    # Check if bass is higher than melody
-                    if b_note.pitch > m_note.pitch:
-                        crossings.append(
-                            {
-                                "time": m_note.start,
-                                "type": "melody-bass crossing",
-                                "melody_pitch": m_note.pitch,
-                                "bass_pitch": b_note.pitch,
-                            }
-                        )
+    def _find_crossings(self, melody: PianoRoll, bass: PianoRoll) -> List[dict]:
+        """Bass notes sounding above an overlapping melody note, in melody order"""
+        crossings = []
+        if not melody.notes or not bass.notes:
+            return crossings
+
+        m, b = melody.arrays, bass.arrays
+        # Compare blocks of melody notes against every bass note at once,
+        # bounding the size of the boolean matrix
+        for lo in range(0, len(m.starts), self.CROSSING_BLOCK_SIZE):
+            hi = lo + self.CROSSING_BLOCK_SIZE
+            hits = (
+                # Overlap in time
+                (m.ends[lo:hi, None] > b.starts)
+                & (b.ends > m.starts[lo:hi, None])
+                # Bass higher than melody
+                & (b.pitches > m.pitches[lo:hi, None])
+            )
+            for i, j in zip(*np.nonzero(hits)):
+                m_note = melody.notes[lo + i]
+                crossings.append(
+                    {
+                        "time": m_note.start,
+                        "type": "melody-bass crossing",
+                        "melody_pitch": m_note.pitch,
+                        "bass_pitch": bass.notes[j].pitch,
+                    }
+                )
 
         return crossings
 
@@ -1,35 +1,103 @@
-import pretty_midi
+import copy
 import os
+from itertools import chain
+
+import numpy as np
+
+try:
+    from symusic import Score, Track, Tempo, Note as ScoreNote
+except ImportError:  # Fall back to the slower pretty_midi writer
+    Score = None
+    import pretty_midi
+
+    # Built once; each file gets a shallow copy with its own instrument list
+    _BASE_MIDI = pretty_midi.PrettyMIDI()
+
+
+# One row per note: onset and length in seconds, MIDI pitch and velocity
+NOTE_DTYPE = np.dtype(
+    [("time", "f4"), ("duration", "f4"), ("pitch", "i1"), ("velocity", "i1")]
+)
+
+
+def _note_table(times, durations, pitches, velocities):
+    """
+    Build a note table from per-column arrays (scalars are broadcast).
+
+    Args:
+        times: Note onsets in seconds
+        durations: Note lengths in seconds
+        pitches: MIDI pitch numbers
+        velocities: MIDI velocities
+
+    Returns:
+        Structured array with NOTE_DTYPE fields
+    """
+    pitches = np.asarray(pitches)
+    notes = np.empty(pitches.shape[0], dtype=NOTE_DTYPE)
+    notes["time"] = times
+    notes["duration"] = durations
+    notes["pitch"] = pitches
+    notes["velocity"] = velocities
+    return notes
+
+
+def _write_score(notes, output_path):
+    """
+    Write a note table to a single-track piano MIDI file.
+
+    Args:
+        notes: Structured array with NOTE_DTYPE fields
+        output_path: Path of the MIDI file to create
+
+    Returns:
+        The symusic Score (or PrettyMIDI object when symusic is missing)
+    """
+    if Score is None:
+        midi = copy.copy(_BASE_MIDI)
+        piano = pretty_midi.Instrument(program=0, name="Piano")
+        piano.notes.extend(
+            pretty_midi.Note(
+                velocity=velocity, pitch=pitch, start=start, end=start + duration
+            )
+            for start, duration, pitch, velocity in notes.tolist()
+        )
+        midi.instruments = [piano]
+        midi.write(output_path)
+        return midi
 
+    score = Score(ttype="second")
+    score.tempos.append(Tempo(time=0, qpm=120, ttype="second"))
 
-def create_simple_melody():
-    """simple C major scale melody for testing"""
+    piano = Track(name="Piano", program=0, ttype="second")
+    # Fields of a structured array are strided views; symusic needs
+    # contiguous columns
+    piano.notes = ScoreNote.from_numpy(
+        time=np.ascontiguousarray(notes["time"]),
+        duration=np.ascontiguousarray(notes["duration"]),
+        pitch=np.ascontiguousarray(notes["pitch"]),
+        velocity=np.ascontiguousarray(notes["velocity"]),
+        ttype="second",
+    )
+    score.tracks.append(piano)
 
-    # Create a PrettyMIDI object
-    midi = pretty_midi.PrettyMIDI()
+    score.dump_midi(output_path)
+    return score
 
-    # Create a piano instrument
-    piano = pretty_midi.Instrument(program=0, name="Piano")
 
-    # C major scale: C, D, E, F, G, A, B, C
-    notes = [60, 62, 64, 65, 67, 69, 71, 72]  # MIDI note numbers
-
-    # Add notes (each lasts 0.5 seconds)
-    for i, note_num in enumerate(notes):
-        start_time = i * 0.5
-        end_time = start_time + 0.4  # Slight gap between notes
+def create_simple_melody():
+    """simple C major scale melody for testing"""
 
-        note = pretty_midi.Note(
-            velocity=100, pitch=note_num, start=start_time, end=end_time
-        )
-        piano.notes.append(note)
+    # C major scale: C, D, E, F, G, A, B, C
+    pitches = np.array([60, 62, 64, 65, 67, 69, 71, 72], dtype=np.int8)
 
-    # Add the instrument to the MIDI object
-    midi.instruments.append(piano)
+    # Notes start every 0.5 seconds, 0.4s long for a slight gap between them
+    starts = np.arange(len(pitches), dtype=np.float32) * 0.5
+    notes = _note_table(starts, 0.4, pitches, 100)
 
     # Save the MIDI file
     output_path = "test_melody.mid"
-    midi.write(output_path)
+    midi = _write_score(notes, output_path)
     print(f" Created {output_path} - a simple C major scale")
 
     return midi
@@ -38,32 +106,24 @@ def create_simple_melody():
 def create_simple_chord_progression():
     """simple chord progression for testing"""
 
-    midi = pretty_midi.PrettyMIDI()
-    piano = pretty_midi.Instrument(program=0, name="Piano")
-
     # Simple chord progression: C - Am - F - G
-    chords = [
-        [60, 64, 67],  # C major (C-E-G)
-        [57, 60, 64],  # A minor (A-C-E)
-        [53, 57, 60],  # F major (F-A-C)
-        [55, 59, 62],  # G major (G-B-D)
-    ]
-
-    # Add chords (each lasts 1 second)
-    for i, chord in enumerate(chords):
-        start_time = i * 1.0
-        end_time = start_time + 0.8
-
-        for note_num in chord:
-            note = pretty_midi.Note(
-                velocity=80, pitch=note_num, start=start_time, end=end_time
-            )
-            piano.notes.append(note)
-
-    midi.instruments.append(piano)
+    chords = np.array(
+        [
+            [60, 64, 67],  # C major (C-E-G)
+            [57, 60, 64],  # A minor (A-C-E)
+            [53, 57, 60],  # F major (F-A-C)
+            [55, 59, 62],  # G major (G-B-D)
+        ],
+        dtype=np.int8,
+    )
+
+    # Add chords (one per second, each held for 0.8 seconds)
+    num_chords, chord_size = chords.shape
+    starts = np.repeat(np.arange(num_chords, dtype=np.float32), chord_size)
+    notes = _note_table(starts, 0.8, chords.ravel(), 80)
 
     output_path = "test_chords.mid"
-    midi.write(output_path)
+    midi = _write_score(notes, output_path)
     print(f" Created {output_path} - simple chord progression (C-Am-F-G)")
 
     return midi
@@ -72,9 +132,6 @@ def create_simple_chord_progression():
 def create_complex_example():
     """more complex example with melody and accompaniment"""
 
-    midi = pretty_midi.PrettyMIDI()
-    piano = pretty_midi.Instrument(program=0, name="Piano")
-
     # Melody line (right hand)
     melody_notes = [
         (72, 0.0, 0.5, 90),  # C5
@@ -99,14 +156,18 @@ def create_complex_example():
     ]
 
     # Add all notes
-    for pitch, start, end, velocity in melody_notes + bass_notes + harmony_notes:
-        note = pretty_midi.Note(velocity=velocity, pitch=pitch, start=start, end=end)
-        piano.notes.append(note)
-
-    midi.instruments.append(piano)
+    notes = np.array(
+        [
+            (start, end - start, pitch, velocity)
+            for pitch, start, end, velocity in chain(
+                melody_notes, bass_notes, harmony_notes
+            )
+        ],
+        dtype=NOTE_DTYPE,
+    )
 
     output_path = "test_complex.mid"
-    midi.write(output_path)
+    midi = _write_score(notes, output_path)
     print(f"Created {output_path} - melody with bass and harmony")
 
     return midi
@@ -115,9 +176,6 @@ def create_complex_example():
 def create_rhythm_test():
     """file with various note durations for rhythm testing"""
 
-    midi = pretty_midi.PrettyMIDI()
-    piano = pretty_midi.Instrument(program=0, name="Piano")
-
     # Various note durations
     note_data = [
         # (pitch, start, duration, velocity)
@@ -138,16 +196,16 @@ def create_rhythm_test():
         (60, 3.875, 0.125, 90),
     ]
 
-    for pitch, start, duration, velocity in note_data:
-        note = pretty_midi.Note(
-            velocity=velocity, pitch=pitch, start=start, end=start + duration
-        )
-        piano.notes.append(note)
-
-    midi.instruments.append(piano)
+    notes = np.array(
+        [
+            (start, duration, pitch, velocity)
+            for pitch, start, duration, velocity in note_data
+        ],
+        dtype=NOTE_DTYPE,
+    )
 
     output_path = "test_rhythm.mid"
-    midi.write(output_path)
+    midi = _write_score(notes, output_path)
     print(f" Created {output_path} - various note durations")
 
     return midi
@@ -156,27 +214,24 @@ def create_rhythm_test():
 def create_out_of_range_test():
     """file with notes outside piano range for error testing"""
 
-    midi = pretty_midi.PrettyMIDI()
-    piano = pretty_midi.Instrument(program=0, name="Piano")
-
     # Mix of normal and out-of-range notes
-    notes = [
+    note_data = [
         (20, 0.0, 0.5, 80),  # Below piano range (A0 is 21)
         (60, 0.5, 0.5, 80),  # Normal
         (109, 1.0, 0.5, 80),  # Above piano range (C8 is 108)
         (72, 1.5, 0.5, 80),  # Normal
     ]
 
-    for pitch, start, duration, velocity in notes:
-        note = pretty_midi.Note(
-            velocity=velocity, pitch=pitch, start=start, end=start + duration
-        )
-        piano.notes.append(note)
-
-    midi.instruments.append(piano)
+    notes = np.array(
+        [
+            (start, duration, pitch, velocity)
+            for pitch, start, duration, velocity in note_data
+        ],
+        dtype=NOTE_DTYPE,
+    )
 
     output_path = "test_out_of_range.mid"
-    midi.write(output_path)
+    midi = _write_score(notes, output_path)
     print(f" Created {output_path} - includes notes outside piano range")
 
     return midi
@@ -189,9 +244,6 @@ def create_sloppy_timing_test():
 
     random.seed(42)  # Consistent randomness for reproducibility
 
-    midi = pretty_midi.PrettyMIDI()
-    piano = pretty_midi.Instrument(program=0, name="Piano")
-
     # C major scale with humanized timing (should be on 16th note grid)
     # Perfect timing would be: 0.0, 0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 1.75
     base_times = [0.0, 0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 1.75, 2.0, 2.25, 2.5, 2.75]
@@ -200,6 +252,7 @@ def create_sloppy_timing_test():
     print("\n  Creating sloppy timing test:")
     print("  Perfect vs Actual timing (first 8 notes):")
 
+    rows = []
     for i, (perfect_time, pitch) in enumerate(zip(base_times, pitches)):
         # Add random timing error: -30ms to +30ms
         timing_error = random.uniform(-0.03, 0.03)
@@ -216,18 +269,10 @@ def create_sloppy_timing_test():
                 f"    Note {i+1}: Perfect={perfect_time:.3f}s, Actual={actual_start:.3f}s, Error={timing_error*1000:+.1f}ms"
             )
 
-        note = pretty_midi.Note(
-            velocity=velocity,
-            pitch=pitch,
-            start=actual_start,
-            end=actual_start + duration,
-        )
-        piano.notes.append(note)
-
-    midi.instruments.append(piano)
+        rows.append((actual_start, duration, pitch, velocity))
 
     output_path = "test_sloppy_timing.mid"
-    midi.write(output_path)
+    midi = _write_score(np.array(rows, dtype=NOTE_DTYPE), output_path)
     print(f"   Created {output_path} - humanized timing with ±30ms errors")
 
     return midi
@@ -240,9 +285,6 @@ def create_extreme_sloppy_test():
 
     random.seed(123)
 
-    midi = pretty_midi.PrettyMIDI()
-    piano = pretty_midi.Instrument(program=0, name="Piano")
-
     # Chord progression with very sloppy timing
     # Each chord should be on beat, but notes are rolled/spread out
     chord_times = [0.0, 1.0, 2.0, 3.0]
@@ -255,6 +297,7 @@ def create_extreme_sloppy_test():
 
     print("\n  Creating extreme sloppy timing test (rolled chords):")
 
+    rows = []
     for chord_time, chord_pitches in zip(chord_times, chords):
         print(f"    Chord at {chord_time}s:")
         for j, pitch in enumerate(chord_pitches):
@@ -271,18 +314,10 @@ def create_extreme_sloppy_test():
                 f"      Note {j+1}: starts at {actual_start:.3f}s (delay: {roll_delay*1000:.1f}ms)"
             )
 
-            note = pretty_midi.Note(
-                velocity=velocity,
-                pitch=pitch,
-                start=actual_start,
-                end=actual_start + duration,
-            )
-            piano.notes.append(note)
-
-    midi.instruments.append(piano)
+            rows.append((actual_start, duration, pitch, velocity))
 
     output_path = "test_extreme_sloppy.mid"
-    midi.write(output_path)
+    midi = _write_score(np.array(rows, dtype=NOTE_DTYPE), output_path)
     print(f"Created {output_path} - extreme timing variations (rolled chords)")
 
     return midi
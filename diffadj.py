@@ -7,7 +7,6 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from autoscribe import load_midi
 from autoscribe.core.difficulty_adjuster import (
     DifficultyAdjuster, 
     DifficultyConfig, 
@@ -15,7 +14,8 @@ from autoscribe.core.difficulty_adjuster import (
     adjust_difficulty
 )
 from autoscribe.core.musicxml_exporter import export_to_musicxml
-import matplotlib.pyplot as plt
+from autoscribe._loading import load_cached
+from autoscribe._viz import note_collection
 
 
 def visualize_difficulty_comparison(original, adjusted, title="Difficulty Adjustment"):
@@ -27,29 +27,21 @@ def visualize_difficulty_comparison(original, adjusted, title="Difficulty Adjust
         adjusted: Adjusted PianoRoll
         title: Plot title
     """
+    import matplotlib.pyplot as plt
+
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10), sharex=True)
     
     max_duration = min(10, original.get_duration())
     
     # Plot original
-    for note in original.notes:
-        if note.start < max_duration:
-            alpha = 0.5 + (note.velocity / 127) * 0.4
-            ax1.add_patch(plt.Rectangle(
-                (note.start, note.pitch), note.duration, 0.8,
-                facecolor='red', edgecolor='darkred',
-                alpha=alpha, linewidth=0.5
-            ))
+    ax1.add_collection(note_collection(
+        original, max_duration, 'red', 'darkred', alpha_range=(0.5, 0.4)
+    ))
     
     # Plot adjusted
-    for note in adjusted.notes:
-        if note.start < max_duration:
-            alpha = 0.5 + (note.velocity / 127) * 0.4
-            ax2.add_patch(plt.Rectangle(
-                (note.start, note.pitch), note.duration, 0.8,
-                facecolor='green', edgecolor='darkgreen',
-                alpha=alpha, linewidth=0.5
-            ))
+    ax2.add_collection(note_collection(
+        adjusted, max_duration, 'green', 'darkgreen', alpha_range=(0.5, 0.4)
+    ))
     
     # Formatting
     pitch_range = original.get_pitch_range()
@@ -85,7 +77,7 @@ def test_difficulty_adjustment(midi_path: str,
     print(f"Target Level: {target_level.value}")
         # Load original
     print("\n--- Loading Original MIDI ---")
-    original = load_midi(midi_path)
+    original = load_cached(midi_path)
     
     # Analyze original difficulty
     print("\n--- Original Difficulty Analysis ---")
@@ -150,7 +142,7 @@ def compare_all_levels(midi_path: str):
     print("Comparing All Difficulty Levels")
     print(f"{'='*70}")
     
-    original = load_midi(midi_path)
+    original = load_cached(midi_path)
     
     levels = [
         DifficultyLevel.BEGINNER,
@@ -160,40 +152,43 @@ def compare_all_levels(midi_path: str):
     ]
     
     results = []
+    adjuster = DifficultyAdjuster()
     
     for level in levels:
-        adjuster = DifficultyAdjuster(DifficultyConfig(target_level=level))
+        adjuster.set_level(level)
         adjusted = adjuster.adjust_difficulty(original)
         report = adjuster.get_difficulty_report(adjusted)
         results.append((level, report, adjusted))
 
         # Print comparison table
-    print(f"\n{'Level':<15} {'Notes':<10} {'Notes/s':<10} {'Max Chord':<12} {'Max Stretch':<12}")
-    print("-" * 70)
-    
-    for level, report, _ in results:
-        print(f"{level.value:<15} "
-              f"{report['total_notes']:<10} "
-              f"{report['notes_per_second']:<10.2f} "
-              f"{report['max_simultaneous_notes']:<12} "
-              f"{report['max_hand_stretch']:<12}")
+    lines = [
+        f"\n{'Level':<15} {'Notes':<10} {'Notes/s':<10} {'Max Chord':<12} {'Max Stretch':<12}",
+        "-" * 70,
+    ]
+    lines.extend(
+        f"{level.value:<15} "
+        f"{report['total_notes']:<10} "
+        f"{report['notes_per_second']:<10.2f} "
+        f"{report['max_simultaneous_notes']:<12} "
+        f"{report['max_hand_stretch']:<12}"
+        for level, report, _ in results
+    )
+    sys.stdout.write("\n".join(lines) + "\n")
     
     # Visualize all levels
+    import matplotlib.pyplot as plt
+
     fig, axes = plt.subplots(len(levels), 1, figsize=(14, 12), sharex=True)
     max_duration = min(10, original.get_duration())
+    pitch_range = original.get_pitch_range()
     
     for i, (level, report, adjusted) in enumerate(results):
         ax = axes[i]
         
-        for note in adjusted.notes:
-            if note.start < max_duration:
-                ax.add_patch(plt.Rectangle(
-                    (note.start, note.pitch), note.duration, 0.8,
-                    facecolor='steelblue', edgecolor='black',
-                    alpha=0.6, linewidth=0.5
-                ))
+        ax.add_collection(note_collection(
+            adjusted, max_duration, 'steelblue', 'black', alpha=0.6
+        ))
         
-        pitch_range = original.get_pitch_range()
         ax.set_ylim(pitch_range[0] - 2, pitch_range[1] + 2)
         ax.set_ylabel('Pitch')
         ax.set_title(f"{level.value.title()} ({report['total_notes']} notes)", 
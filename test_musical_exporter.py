@@ -6,7 +6,29 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from autoscribe import load_midi
 from autoscribe.core.musicxml_exporter import MusicXMLExporter, export_to_musicxml
 from typing import Optional
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+import io
 import os
+import shutil
+import subprocess
+import time
+
+# MuseScore executables to look for, in order of preference
+MUSESCORE_COMMANDS = [
+    "musescore",
+    "musescore3",
+    "musescore4",
+    "/Applications/MuseScore 3.app/Contents/MacOS/mscore",
+    "/Applications/MuseScore 4.app/Contents/MacOS/mscore",
+    "C:\\Program Files\\MuseScore 3\\bin\\MuseScore3.exe",
+    "C:\\Program Files\\MuseScore 4\\bin\\MuseScore4.exe",
+]
+
+# Resolved once at import so conversions never probe missing executables
+_MUSESCORE_CMDS = [
+    cmd for cmd in MUSESCORE_COMMANDS if shutil.which(cmd) or os.path.exists(cmd)
+]
 
 
 def convert_midi_to_sheet_music(
@@ -19,8 +41,6 @@ def convert_midi_to_sheet_music(
     """
     Complete MIDI to sheet music conversion.
     """
-    from typing import Optional
-
     print(f"\n{'='*70}")
     print("AutoScribe: MIDI to Sheet Music Conversion")
     print(f"{'='*70}")
@@ -59,7 +79,8 @@ def convert_midi_to_sheet_music(
     print(f"{'='*70}")
     print(f"✓ Input MIDI: {midi_path}")
     print(f"✓ Output MusicXML: {output_file}")
-    print(f"✓ File size: {os.path.getsize(output_file):,} bytes")
+    if exporter.last_file_size is not None:
+        print(f"✓ File size: {exporter.last_file_size:,} bytes")
 
     print(f"\n{'='*70}")
     print("Next Steps:")
@@ -73,38 +94,38 @@ def convert_midi_to_sheet_music(
     # open in MuseScore
     if open_in_musescore:
         print(f"\nAttempting to open in MuseScore...")
-        try:
-            import subprocess
-
-            musescore_commands = [
-                "musescore",
-                "musescore3",
-                "musescore4",
-                "/Applications/MuseScore 3.app/Contents/MacOS/mscore",
-                "/Applications/MuseScore 4.app/Contents/MacOS/mscore",
-                "C:\\Program Files\\MuseScore 3\\bin\\MuseScore3.exe",
-                "C:\\Program Files\\MuseScore 4\\bin\\MuseScore4.exe", 
-            ]
-
-            opened = False
-            for cmd in musescore_commands:
-                try:
-                    subprocess.Popen([cmd, output_file])
-                    print(f"✓ Opened in MuseScore")
-                    opened = True
-                    break
-                except (FileNotFoundError, OSError):
-                    continue
-
-            if not opened:
-                print("⚠ MuseScore not found. Please open the file manually.")
-
-        except Exception as e:
-            print(f"⚠ Could not auto-open: {e}")
+        for cmd in _MUSESCORE_CMDS:
+            try:
+                subprocess.Popen([cmd, output_file])
+                print(f"✓ Opened in MuseScore")
+                break
+            except OSError as e:
+                print(f"⚠ Could not auto-open with {cmd}: {e}")
+        else:
+            print("⚠ MuseScore not found. Please open the file manually.")
 
     return output_file
 
 
+def _convert_quietly(midi_path: str, output_path: str) -> float:
+    """
+    Batch worker: convert one file with its step-by-step output buffered
+    in memory, so parallel conversions don't interleave on the terminal.
+
+    Returns:
+        Conversion time in seconds
+    """
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        convert_midi_to_sheet_music(
+            midi_path,
+            output_path,
+            auto_quantize=True,
+            open_in_musescore=False,
+        )
+    return time.perf_counter() - start
+
+
 def batch_convert(midi_directory: str, output_directory: str = "sheet_music"):
     """
     Convert all MIDI files in a directory to sheet music.
@@ -121,9 +142,11 @@ def batch_convert(midi_directory: str, output_directory: str = "sheet_music"):
     os.makedirs(output_directory, exist_ok=True)
 
     # Find all MIDI files
-    midi_files = []
-    for ext in ["*.mid", "*.midi"]:
-        midi_files.extend(Path(midi_directory).glob(ext))
+    midi_files = sorted(
+        Path(entry.path)
+        for entry in os.scandir(midi_directory)
+        if entry.is_file() and entry.name.lower().endswith((".mid", ".midi"))
+    )
 
     if not midi_files:
         print(f"No MIDI files found in {midi_directory}")
@@ -131,34 +154,41 @@ def batch_convert(midi_directory: str, output_directory: str = "sheet_music"):
 
     print(f"Found {len(midi_files)} MIDI files")
 
-    # Convert each file
+    # Convert files in parallel, one process per core
     successful = 0
     failed = 0
+    workers = min(len(midi_files), os.cpu_count() or 1)
 
-    for i, midi_file in enumerate(midi_files, 1):
-        print(f"\n[{i}/{len(midi_files)}] Converting {midi_file.name}...")
-
-        try:
-            output_path = Path(output_directory) / f"{midi_file.stem}.musicxml"
-            convert_midi_to_sheet_music(
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                _convert_quietly,
                 str(midi_file),
-                str(output_path),
-                auto_quantize=True,
-                open_in_musescore=False,
-            )
-            successful += 1
-        except Exception as e:
-            print(f"✗ Failed: {e}")
-            failed += 1
+                str(Path(output_directory) / f"{midi_file.stem}.musicxml"),
+            ): midi_file
+            for midi_file in midi_files
+        }
+
+        for i, future in enumerate(as_completed(futures), 1):
+            midi_file = futures[future]
+            try:
+                elapsed = future.result()
+                print(f"[{i}/{len(midi_files)}] ✓ {midi_file.name}: {elapsed:.2f}s")
+                successful += 1
+            except Exception as e:
+                print(f"[{i}/{len(midi_files)}] ✗ Failed {midi_file.name}: {e}")
+                failed += 1
 
     # Summary
-    print(f"\n{'='*70}")
-    print("Batch Conversion Summary")
-    print(f"{'='*70}")
-    print(f"Total files: {len(midi_files)}")
-    print(f"Successful: {successful}")
-    print(f"Failed: {failed}")
-    print(f"Output directory: {output_directory}")
+    sys.stdout.write(
+        f"\n{'='*70}\n"
+        "Batch Conversion Summary\n"
+        f"{'='*70}\n"
+        f"Total files: {len(midi_files)}\n"
+        f"Successful: {successful}\n"
+        f"Failed: {failed}\n"
+        f"Output directory: {output_directory}\n"
+    )
 
 
 def main():
@@ -7,8 +7,10 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from autoscribe import load_midi, MidiParserError
-import matplotlib.pyplot as plt
+from autoscribe import MidiParser, MidiParserError
+from autoscribe._loading import load_cached
+from autoscribe._viz import draw_notes
+import numpy as np
 
 
 def visualize_piano_roll(piano_roll, duration=None, title="Piano Roll Visualization"):
@@ -19,28 +21,20 @@ def visualize_piano_roll(piano_roll, duration=None, title="Piano Roll Visualizat
         print("No notes to visualize.")
         return
 
+    import matplotlib.pyplot as plt
+
     max_duration = duration or piano_roll.get_duration()
 
     fig, ax = plt.subplots(figsize=(14, 7))
 
-    # Draw each note as a rectangle
-    for note in piano_roll.notes:
-        if note.start < max_duration:
-            alpha = 0.3 + (note.velocity / 127) * 0.6
-            ax.add_patch(
-                plt.Rectangle(
-                    (note.start, note.pitch),
-                    min(note.duration, max_duration - note.start),
-                    0.8,
-                    facecolor="steelblue",
-                    edgecolor="black",
-                    alpha=alpha,
-                    linewidth=0.5,
-                )
-            )
+    pitch_range = piano_roll.get_pitch_range()
+    # One collection of rectangles, or one image for dense rolls
+    draw_notes(
+        ax, piano_roll, max_duration, "steelblue",
+        pitch_range=pitch_range, clip=True
+    )
 
     ax.set_xlim(0, max_duration)
-    pitch_range = piano_roll.get_pitch_range()
     ax.set_ylim(pitch_range[0] - 1, pitch_range[1] + 1)
 
     ax.set_xlabel("Time (seconds)", fontsize=12)
@@ -64,49 +58,55 @@ def visualize_piano_roll(piano_roll, duration=None, title="Piano Roll Visualizat
     plt.tight_layout()
     plt.show()
 
-def analyze_midi(midi_path: str):
+def analyze_midi(midi_path: str, show: bool = True):
     """
-    Load and analyze a MIDI file.
+    Load and analyze a MIDI file, plotting it unless show is False.
     """
     print(f"Loading MIDI file: {midi_path}")
     print("=" * 60)
 
     try:
-        piano_roll = load_midi(midi_path)
+        piano_roll = load_cached(midi_path)
 
-        print("\n--- Detailed Analysis ---")
         stats = piano_roll.get_statistics()
-
-        print("\nBasic Info:")
-        print(f"  Total Notes: {stats['note_count']}")
-        print(f"  Duration: {stats['duration']:.2f} seconds")
-        print(f"  Tempo: {stats['tempo']:.1f} BPM")
-        print(
-            f"  Time Signature: {stats['time_signature'][0]}/{stats['time_signature'][1]}"
+        pitches = piano_roll.arrays.pitches
+        out_of_range = int(
+            np.count_nonzero(
+                (pitches < MidiParser.PIANO_MIN_PITCH)
+                | (pitches > MidiParser.PIANO_MAX_PITCH)
+            )
         )
 
-        print("\nPitch Analysis:")
-        print(f"  Range: {stats['pitch_range'][0]} - {stats['pitch_range'][1]}")
-        print(f"  Average Pitch: {stats['avg_pitch']:.1f}")
-
-        print("\nTiming Analysis:")
-        print(f"  Average Note Duration: {stats['avg_duration']:.3f} seconds")
-        print(f"  Average Velocity: {stats['avg_velocity']:.1f}")
-
-        print("\nFirst 5 Notes:")
-        for i, note in enumerate(piano_roll.notes[:5], 1):
-            print(f"  {i}. {note}")
-
-        out_of_range = [n for n in piano_roll.notes if not n.is_piano_range]
-        if out_of_range:
-            print(f"\nWarning: {len(out_of_range)} notes outside piano range")
-
-        print("\nGenerating visualization...")
-        visualize_piano_roll(
-            piano_roll,
-            duration=min(10, stats["duration"]),
-            title=f"Piano Roll: {Path(midi_path).name}",
+        # Build the whole report and write it out at once
+        lines = [
+            "\n--- Detailed Analysis ---",
+            "\nBasic Info:",
+            f"  Total Notes: {stats['note_count']}",
+            f"  Duration: {stats['duration']:.2f} seconds",
+            f"  Tempo: {stats['tempo']:.1f} BPM",
+            f"  Time Signature: {stats['time_signature'][0]}/{stats['time_signature'][1]}",
+            "\nPitch Analysis:",
+            f"  Range: {stats['pitch_range'][0]} - {stats['pitch_range'][1]}",
+            f"  Average Pitch: {stats['avg_pitch']:.1f}",
+            "\nTiming Analysis:",
+            f"  Average Note Duration: {stats['avg_duration']:.3f} seconds",
+            f"  Average Velocity: {stats['avg_velocity']:.1f}",
+            "\nFirst 5 Notes:",
+        ]
+        lines.extend(
+            f"  {i}. {note}" for i, note in enumerate(piano_roll.notes[:5], 1)
         )
+        if out_of_range:
+            lines.append(f"\nWarning: {out_of_range} notes outside piano range")
+        sys.stdout.write("\n".join(lines) + "\n")
+
+        if show:
+            print("\nGenerating visualization...")
+            visualize_piano_roll(
+                piano_roll,
+                duration=min(10, stats["duration"]),
+                title=f"Piano Roll: {Path(midi_path).name}",
+            )
 
         return piano_roll
 
@@ -136,20 +136,26 @@ def compare_notes(piano_roll, start_time=0, duration=2):
     # Group notes that start at the same time (within 10ms)
     if notes_in_window:
         print("\nSimultaneous note groups (within 10ms):")
-        processed = set()
-        for i, note in enumerate(notes_in_window):
-            if i in processed:
-                continue
-
-            simultaneous = [note]
-            for j, other in enumerate(notes_in_window[i + 1 :], i + 1):
-                if abs(other.start - note.start) < 0.01:
-                    simultaneous.append(other)
-                    processed.add(j)
-
-            if len(simultaneous) > 1:
-                pitches = [n.midi_note_name for n in simultaneous]
-                print(f"  Time {note.start:.3f}s: {pitches}")
+        starts = np.fromiter(
+            (n.start for n in notes_in_window), dtype=np.float64,
+            count=len(notes_in_window)
+        )
+        # Notes are sorted by start, so a group is the run of notes starting
+        # within 10ms of its first note; binary search jumps run to run
+        group_ends = np.searchsorted(starts, starts + 0.01, side="left")
+        i = 0
+        while i < len(starts):
+            end = int(group_ends[i])
+            # Settle the float boundary with the same difference test as before
+            while end < len(starts) and starts[end] - starts[i] < 0.01:
+                end += 1
+            while end > i + 1 and not starts[end - 1] - starts[i] < 0.01:
+                end -= 1
+
+            if end - i > 1:
+                pitches = [n.midi_note_name for n in notes_in_window[i:end]]
+                print(f"  Time {starts[i]:.3f}s: {pitches}")
+            i = end
 
 
 def main():
@@ -173,7 +179,7 @@ def main():
         print(f"File not found: {args.midi_file}")
         return 1
 
-    piano_roll = analyze_midi(args.midi_file)
+    piano_roll = analyze_midi(args.midi_file, show=not args.no_viz)
     if piano_roll is None:
         return 1
 
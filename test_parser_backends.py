@@ -0,0 +1,207 @@
+"""
+Regression check that the symusic and pretty_midi parsers agree.
+
+symusic is opt-in (MidiParser(use_symusic=True)) because the two libraries
+pair overlapping notes on the same pitch differently; the overlap fixture
+below tracks that known difference.
+"""
+
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from autoscribe import MidiParser, MidiParserError
+from autoscribe.core import midi_parser
+import numpy as np
+import pretty_midi
+
+# Writes the default inputs (with symusic when it is installed)
+CREATE_SCRIPT = Path(__file__).parent / "create_test_midi.py"
+
+# Both parsers report times in seconds; allow for tick rounding
+TIME_TOLERANCE = 1e-6
+TEMPO_TOLERANCE = 1e-3
+
+OVERLAP_FIXTURE = "test_overlapping_pitches.mid"
+
+# Files the backends are known to disagree on, and why
+KNOWN_DIFFERENCES = {
+    OVERLAP_FIXTURE: "overlapping notes on the same pitch are paired differently",
+}
+
+
+def write_overlap_fixture(output_dir):
+    """
+    Write a multi-track file with overlapping notes on repeated pitches.
+
+    Args:
+        output_dir: Directory to write the file into
+
+    Returns:
+        Path of the MIDI file
+    """
+    midi = pretty_midi.PrettyMIDI(initial_tempo=120)
+    for program, pitch in ((0, 60), (0, 64), (32, 40)):
+        instrument = pretty_midi.Instrument(program=program)
+        # Each note starts before the previous one on its pitch has ended
+        instrument.notes = [
+            pretty_midi.Note(velocity=100 - 10 * i, pitch=pitch, start=start, end=end)
+            for i, (start, end) in enumerate(
+                ((0.0, 1.0), (0.5, 1.5), (0.6, 0.8), (2.0, 3.0), (2.5, 2.75))
+            )
+        ]
+        midi.instruments.append(instrument)
+
+    output_path = Path(output_dir) / OVERLAP_FIXTURE
+    midi.write(str(output_path))
+    return output_path
+
+
+def _sorted_note_table(piano_roll):
+    """Note attributes as (start, end, pitch, velocity) rows in a fixed order"""
+    arrays = piano_roll.arrays
+    order = np.lexsort(
+        (arrays.velocities, arrays.ends, arrays.pitches, arrays.starts)
+    )
+    return (
+        arrays.starts[order],
+        arrays.ends[order],
+        arrays.pitches[order],
+        arrays.velocities[order],
+    )
+
+
+def compare_backends(midi_path):
+    """
+    Parse a MIDI file with both backends and list their differences.
+
+    Args:
+        midi_path: Path to MIDI file
+
+    Returns:
+        List of mismatch descriptions (empty when the parsers agree)
+    """
+    path = str(midi_path)
+    MidiParser.validate_path(path)
+    symusic_roll = MidiParser()._load_symusic(path)
+    pretty_roll = MidiParser()._load_pretty_midi(path)
+
+    mismatches = []
+    if len(symusic_roll.notes) != len(pretty_roll.notes):
+        mismatches.append(
+            f"note count: symusic {len(symusic_roll.notes)}, "
+            f"pretty_midi {len(pretty_roll.notes)}"
+        )
+    else:
+        s_starts, s_ends, s_pitches, s_velocities = _sorted_note_table(symusic_roll)
+        p_starts, p_ends, p_pitches, p_velocities = _sorted_note_table(pretty_roll)
+        if not np.array_equal(s_pitches, p_pitches):
+            mismatches.append("note pitches differ")
+        if not np.array_equal(s_velocities, p_velocities):
+            mismatches.append("note velocities differ")
+        if not np.allclose(s_starts, p_starts, rtol=0, atol=TIME_TOLERANCE):
+            mismatches.append("note start times differ")
+        if not np.allclose(s_ends, p_ends, rtol=0, atol=TIME_TOLERANCE):
+            mismatches.append("note end times differ")
+
+    if abs(symusic_roll.tempo - pretty_roll.tempo) > TEMPO_TOLERANCE:
+        mismatches.append(
+            f"tempo: symusic {symusic_roll.tempo}, pretty_midi {pretty_roll.tempo}"
+        )
+    if tuple(symusic_roll.time_signature) != tuple(pretty_roll.time_signature):
+        mismatches.append(
+            f"time signature: symusic {symusic_roll.time_signature}, "
+            f"pretty_midi {pretty_roll.time_signature}"
+        )
+    if symusic_roll.key_signature != pretty_roll.key_signature:
+        mismatches.append(
+            f"key signature: symusic {symusic_roll.key_signature}, "
+            f"pretty_midi {pretty_roll.key_signature}"
+        )
+    return mismatches
+
+
+def check_files(midi_files):
+    """
+    Compare both parsers on each file and print a report.
+
+    Args:
+        midi_files: Paths of MIDI files
+
+    Returns:
+        Exit code (0 when every file matches)
+    """
+    failures = 0
+    for midi_file in midi_files:
+        try:
+            mismatches = compare_backends(midi_file)
+        except MidiParserError as e:
+            print(f"ERROR {midi_file}: {e}")
+            failures += 1
+            continue
+
+        known = KNOWN_DIFFERENCES.get(Path(midi_file).name)
+        if mismatches and known:
+            print(f"KNOWN {midi_file} ({known})")
+            for mismatch in mismatches:
+                print(f"      {mismatch}")
+        elif mismatches:
+            failures += 1
+            print(f"FAIL  {midi_file}")
+            for mismatch in mismatches:
+                print(f"      {mismatch}")
+        elif known:
+            print(f"OK    {midi_file} (no longer differs: {known})")
+        else:
+            print(f"OK    {midi_file}")
+
+    print(
+        f"\n{len(midi_files) - failures}/{len(midi_files)} files match "
+        "or differ as known."
+    )
+    return 1 if failures else 0
+
+
+
+def main():
+    """Main entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Check that the symusic and pretty_midi parsers agree"
+    )
+    parser.add_argument(
+        "midi_files",
+        nargs="*",
+        help="MIDI files to check (default: fresh output of create_test_midi.py)",
+    )
+    args = parser.parse_args()
+
+    if midi_parser.symusic is None:
+        print("symusic is not installed; skipped parser comparison.")
+        return 0
+
+    if args.midi_files:
+        return check_files(args.midi_files)
+
+    # Regenerating the fixtures also smoke-tests the symusic writer
+    with tempfile.TemporaryDirectory() as output_dir:
+        result = subprocess.run(
+            [sys.executable, str(CREATE_SCRIPT)],
+            cwd=output_dir,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            print("create_test_midi.py failed:")
+            print(result.stderr)
+            return 1
+        write_overlap_fixture(output_dir)
+        return check_files(sorted(Path(output_dir).glob("*.mid")))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,29 @@
 import sys
+from itertools import islice
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from autoscribe import load_midi
 from autoscribe.core.rhythm_quantizer import (
     RhythmQuantizer,
     QuantizationConfig,
     quantize_piano_roll,
 )
+from autoscribe._loading import load_cached
+from autoscribe._viz import note_collection
 import matplotlib.pyplot as plt
 
 
+def _quantized(original, grid_resolution, strength=1.0):
+    """Quantize a roll, reusing the result cached on it for the same settings"""
+    return original.cached(
+        f"quantized[{grid_resolution}, {strength}]",
+        lambda: quantize_piano_roll(
+            original, grid_resolution=grid_resolution, strength=strength
+        ),
+    )
+
+
 def visualize_quantization_comparison(
     original: "PianoRoll", quantized: "PianoRoll", max_duration: float = 5.0
 ):
@@ -21,36 +33,14 @@ def visualize_quantization_comparison(
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10), sharex=True)
 
     # Original
-    for note in original.notes:
-        if note.start < max_duration:
-            alpha = 0.3 + (note.velocity / 127) * 0.6
-            ax1.add_patch(
-                plt.Rectangle(
-                    (note.start, note.pitch),
-                    min(note.duration, max_duration - note.start),
-                    0.8,
-                    facecolor="indianred",
-                    edgecolor="black",
-                    alpha=alpha,
-                    linewidth=0.5,
-                )
-            )
+    ax1.add_collection(
+        note_collection(original, max_duration, "indianred", clip=True)
+    )
 
     # Quantized
-    for note in quantized.notes:
-        if note.start < max_duration:
-            alpha = 0.3 + (note.velocity / 127) * 0.6
-            ax2.add_patch(
-                plt.Rectangle(
-                    (note.start, note.pitch),
-                    min(note.duration, max_duration - note.start),
-                    0.8,
-                    facecolor="steelblue",
-                    edgecolor="black",
-                    alpha=alpha,
-                    linewidth=0.5,
-                )
-            )
+    ax2.add_collection(
+        note_collection(quantized, max_duration, "steelblue", clip=True)
+    )
 
     # Axes setup
     pitch_range = original.get_pitch_range()
@@ -72,16 +62,18 @@ def show_timing_shifts(original: "PianoRoll", quantized: "PianoRoll"):
     """
     Print timing shifts for the first 10 notes.
     """
-    print("\n--- Timing Shifts (first 10 notes) ---")
-    print(f"{'Original Start':<15} {'Quantized Start':<15} {'Shift (ms)':<12} {'Pitch':<8}")
-    print("-" * 60)
-
-    for orig_note, quant_note in zip(original.notes[:10], quantized.notes[:10]):
-        shift_ms = (quant_note.start - orig_note.start) * 1000
-        print(
-            f"{orig_note.start:<15.4f} {quant_note.start:<15.4f} "
-            f"{shift_ms:>+11.2f} {orig_note.midi_note_name:<8}"
-        )
+    lines = [
+        "\n--- Timing Shifts (first 10 notes) ---",
+        f"{'Original Start':<15} {'Quantized Start':<15} {'Shift (ms)':<12} {'Pitch':<8}",
+        "-" * 60,
+    ]
+    lines.extend(
+        f"{orig_note.start:<15.4f} {quant_note.start:<15.4f} "
+        f"{(quant_note.start - orig_note.start) * 1000:>+11.2f} "
+        f"{orig_note.midi_note_name:<8}"
+        for orig_note, quant_note in islice(zip(original.notes, quantized.notes), 10)
+    )
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def analyze_and_quantize(midi_path: str, grid_resolution: str = "16th", strength: float = 1.0):
     """
@@ -96,7 +88,7 @@ def analyze_and_quantize(midi_path: str, grid_resolution: str = "16th", strength
 
     # Load MIDI
     print("\n--- Loading Original MIDI ---")
-    original = load_midi(midi_path)
+    original = load_cached(midi_path)
 
     # Analyze before quantization
     config = QuantizationConfig(grid_resolution=grid_resolution, strength=strength)
@@ -112,7 +104,7 @@ def analyze_and_quantize(midi_path: str, grid_resolution: str = "16th", strength
 
     # Quantize
     print("\n--- Quantizing ---")
-    quantized = quantizer.quantize(original)
+    quantized = _quantized(original, grid_resolution, strength)
     print(f"Quantized {len(quantized.notes)} notes")
 
     # Show timing shifts
@@ -141,47 +133,28 @@ def test_different_resolutions(midi_path: str):
     print("Testing Different Grid Resolutions")
     print(f"{'='*70}")
 
-    original = load_midi(midi_path)
+    original = load_cached(midi_path)
     resolutions = ["8th", "16th", "32nd"]
 
-    fig, axes = plt.subplots(len(resolutions) + 1, 1, figsize=(14, 12), sharex=True)
+    # Quantize everything first, then draw every panel the same way
+    panels = [(original, "Original", "gray")]
+    panels.extend(
+        (
+            _quantized(original, resolution),
+            f"Quantized to {resolution} notes",
+            "steelblue",
+        )
+        for resolution in resolutions
+    )
+
+    fig, axes = plt.subplots(len(panels), 1, figsize=(14, 12), sharex=True)
     max_duration = min(5.0, original.get_duration())
 
-    # Original
-    ax = axes[0]
-    for note in original.notes:
-        if note.start < max_duration:
-            ax.add_patch(
-                plt.Rectangle(
-                    (note.start, note.pitch),
-                    note.duration,
-                    0.8,
-                    facecolor="gray",
-                    edgecolor="black",
-                    alpha=0.6,
-                )
-            )
-    ax.set_title("Original", fontweight="bold")
-    ax.set_ylabel("Pitch")
-    ax.grid(True, alpha=0.3)
-
-    # Each resolution
-    for idx, resolution in enumerate(resolutions, 1):
-        quantized = quantize_piano_roll(original, grid_resolution=resolution)
-        ax = axes[idx]
-        for note in quantized.notes:
-            if note.start < max_duration:
-                ax.add_patch(
-                    plt.Rectangle(
-                        (note.start, note.pitch),
-                        note.duration,
-                        0.8,
-                        facecolor="steelblue",
-                        edgecolor="black",
-                        alpha=0.6,
-                    )
-                )
-        ax.set_title(f"Quantized to {resolution} notes", fontweight="bold")
+    for ax, (roll, title, color) in zip(axes, panels):
+        ax.add_collection(
+            note_collection(roll, max_duration, color, alpha=0.6, linewidth=1.0)
+        )
+        ax.set_title(title, fontweight="bold")
         ax.set_ylabel("Pitch")
         ax.grid(True, alpha=0.3)
 
@@ -2,17 +2,102 @@
 Script for voice separator w/ color code
 """
 
+import hashlib
+import os
+import pickle
 import sys
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from autoscribe import load_midi
+from autoscribe import load_midi, PianoRoll
 from autoscribe.core.voice_separator import VoiceSeparator, VoiceSeparationConfig
-from autoscribe.core.rhythm_quantizer import quantize_piano_roll
-import matplotlib.pyplot as plt
+from autoscribe.core.rhythm_quantizer import QuantizationConfig, RhythmQuantizer
+from autoscribe._viz import draw_notes, visible_pitch_range
 import numpy as np
 
+# Fill and edge/title colors for each voice, shared by every plot
+VOICE_COLORS = MappingProxyType(
+    {"original": "gray", "melody": "red", "harmony": "blue", "bass": "green"}
+)
+VOICE_EDGE_COLORS = MappingProxyType(
+    {
+        "original": "black",
+        "melody": "darkred",
+        "harmony": "darkblue",
+        "bass": "darkgreen",
+    }
+)
+
+# Settings every separation in this script runs with
+SEPARATION_CONFIG = VoiceSeparationConfig()
+QUANTIZATION_CONFIG = QuantizationConfig(grid_resolution='16th')
+
+# Pickled (piano roll, voices) results, reused across runs with --cache
+CACHE_DIR = Path.home() / ".cache" / "autoscribe"
+
+
+@lru_cache(maxsize=None)
+def _source_digest():
+    """Hash of the modules a cached separation was computed by"""
+    digest = hashlib.sha1()
+    for obj in (load_midi, PianoRoll, RhythmQuantizer, VoiceSeparator):
+        digest.update(Path(sys.modules[obj.__module__].__file__).read_bytes())
+    return digest.hexdigest()
+
+
+def _cache_version():
+    """Fingerprint of the code and settings of a separation"""
+    return hashlib.sha1(repr((
+        _source_digest(),
+        SEPARATION_CONFIG,
+        QUANTIZATION_CONFIG,
+    )).encode()).hexdigest()
+
+
+@lru_cache(maxsize=32)
+def _cached_separation(midi_path, mtime_ns, size, quantize_first, version):
+    """
+    Load, optionally quantize and separate a MIDI file once per (path,
+    modification time, size, quantize_first, code/settings version), in
+    memory and on disk.
+    """
+    key = f"{midi_path}|{mtime_ns}|{size}|{quantize_first}|{version}".encode()
+    cache_file = CACHE_DIR / f"voices-{hashlib.sha1(key).hexdigest()}.pkl"
+    try:
+        with open(cache_file, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+
+    result = _separate(midi_path, quantize_first)
+
+    # Write to a temporary file first so a crash never leaves half a pickle
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass  # Caching is best-effort
+    return result
+
+
+def _separate(midi_path, quantize_first):
+    """Load, optionally quantize and separate a MIDI file"""
+    piano_roll = load_midi(midi_path)
+
+    # Optional quantization
+    if quantize_first:
+        print("Quantizing timing...")
+        piano_roll = RhythmQuantizer(QUANTIZATION_CONFIG).quantize(piano_roll)
+
+    separator = VoiceSeparator(SEPARATION_CONFIG)
+    return piano_roll, separator.separate_voices(piano_roll)
+
 
 def visualize_voice_separation(original, melody, harmony, bass, max_duration=10.0):
     """
@@ -25,98 +110,69 @@ def visualize_voice_separation(original, melody, harmony, bass, max_duration=10.
         bass: Bass PianoRoll
         max_duration: Maximum time to display
     """
+    import matplotlib.pyplot as plt
+
     fig, axes = plt.subplots(4, 1, figsize=(14, 12), sharex=True)
 
-    # Define colors for each voice
-    colors = {"original": "gray", "melody": "red", "harmony": "blue", "bass": "green"}
+    # Consistent y-axis range for every panel, fitted to the notes on screen
+    pitch_range = (
+        visible_pitch_range([original], max_duration) or original.get_pitch_range()
+    )
 
     # Plot original
     ax = axes[0]
-    for note in original.notes:
-        if note.start < max_duration:
-            alpha = 0.5 + (note.velocity / 127) * 0.4
-            ax.add_patch(
-                plt.Rectangle(
-                    (note.start, note.pitch),
-                    note.duration,
-                    0.8,
-                    facecolor=colors["original"],
-                    edgecolor="black",
-                    alpha=alpha,
-                    linewidth=0.5,
-                )
-            )
+    draw_notes(
+        ax, original, max_duration,
+        VOICE_COLORS["original"], VOICE_EDGE_COLORS["original"],
+        alpha_range=(0.5, 0.4), pitch_range=pitch_range
+    )
     ax.set_title("Original (All Notes)", fontweight="bold", fontsize=12)
     ax.set_ylabel("Pitch")
     ax.grid(True, alpha=0.3)
 
     # Plot melody
     ax = axes[1]
-    for note in melody.notes:
-        if note.start < max_duration:
-            alpha = 0.6 + (note.velocity / 127) * 0.3
-            ax.add_patch(
-                plt.Rectangle(
-                    (note.start, note.pitch),
-                    note.duration,
-                    0.8,
-                    facecolor=colors["melody"],
-                    edgecolor="darkred",
-                    alpha=alpha,
-                    linewidth=0.5,
-                )
-            )
-    ax.set_title("Melody (Top Voice)", fontweight="bold", fontsize=12, color="darkred")
+    draw_notes(
+        ax, melody, max_duration,
+        VOICE_COLORS["melody"], VOICE_EDGE_COLORS["melody"],
+        alpha_range=(0.6, 0.3), pitch_range=pitch_range
+    )
+    ax.set_title(
+        "Melody (Top Voice)", fontweight="bold", fontsize=12,
+        color=VOICE_EDGE_COLORS["melody"]
+    )
     ax.set_ylabel("Pitch")
     ax.grid(True, alpha=0.3)
 
     # Plot harmony
     ax = axes[2]
-    for note in harmony.notes:
-        if note.start < max_duration:
-            alpha = 0.5 + (note.velocity / 127) * 0.3
-            ax.add_patch(
-                plt.Rectangle(
-                    (note.start, note.pitch),
-                    note.duration,
-                    0.8,
-                    facecolor=colors["harmony"],
-                    edgecolor="darkblue",
-                    alpha=alpha,
-                    linewidth=0.5,
-                )
-            )
+    draw_notes(
+        ax, harmony, max_duration,
+        VOICE_COLORS["harmony"], VOICE_EDGE_COLORS["harmony"],
+        alpha_range=(0.5, 0.3), pitch_range=pitch_range
+    )
     ax.set_title(
-        "Harmony (Inner Voices)", fontweight="bold", fontsize=12, color="darkblue"
+        "Harmony (Inner Voices)", fontweight="bold", fontsize=12,
+        color=VOICE_EDGE_COLORS["harmony"]
     )
     ax.set_ylabel("Pitch")
     ax.grid(True, alpha=0.3)
 
     # Plot bass
     ax = axes[3]
-    for note in bass.notes:
-        if note.start < max_duration:
-            alpha = 0.6 + (note.velocity / 127) * 0.3
-            ax.add_patch(
-                plt.Rectangle(
-                    (note.start, note.pitch),
-                    note.duration,
-                    0.8,
-                    facecolor=colors["bass"],
-                    edgecolor="darkgreen",
-                    alpha=alpha,
-                    linewidth=0.5,
-                )
-            )
+    draw_notes(
+        ax, bass, max_duration,
+        VOICE_COLORS["bass"], VOICE_EDGE_COLORS["bass"],
+        alpha_range=(0.6, 0.3), pitch_range=pitch_range
+    )
     ax.set_title(
-        "Bass (Bottom Voice)", fontweight="bold", fontsize=12, color="darkgreen"
+        "Bass (Bottom Voice)", fontweight="bold", fontsize=12,
+        color=VOICE_EDGE_COLORS["bass"]
     )
     ax.set_ylabel("Pitch")
     ax.set_xlabel("Time (seconds)")
     ax.grid(True, alpha=0.3)
 
-    # Set consistent y-axis range
-    pitch_range = original.get_pitch_range()
     for ax in axes:
         ax.set_ylim(pitch_range[0] - 2, pitch_range[1] + 2)
         ax.set_xlim(0, max_duration)
@@ -134,98 +190,137 @@ def visualize_combined_voices(melody, harmony, bass, max_duration=10.0):
         bass: Bass PianoRoll
         max_duration: Maximum time to display
     """
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots(figsize=(14, 8))
     
-    # Plot all voices with different colors
-    for note in melody.notes:
-        if note.start < max_duration:
-            ax.add_patch(plt.Rectangle(
-                (note.start, note.pitch), note.duration, 0.8,
-                facecolor='red', edgecolor='darkred',
-                alpha=0.7, linewidth=0.5, label='Melody' if note == melody.notes[0] else ''
-            ))
-    
-    for note in harmony.notes:
-        if note.start < max_duration:
-            ax.add_patch(plt.Rectangle(
-                (note.start, note.pitch), note.duration, 0.8,
-                facecolor='blue', edgecolor='darkblue',
-                alpha=0.6, linewidth=0.5, label='Harmony' if note == harmony.notes[0] else ''
-            ))
-    
-    for note in bass.notes:
-        if note.start < max_duration:
-            ax.add_patch(plt.Rectangle(
-                (note.start, note.pitch), note.duration, 0.8,
-                facecolor='green', edgecolor='darkgreen',
-                alpha=0.7, linewidth=0.5, label='Bass' if note == bass.notes[0] else ''
-            ))
-    
-    # Calculate pitch range from all voices
-    all_pitches = []
-    all_pitches.extend([n.pitch for n in melody.notes])
-    all_pitches.extend([n.pitch for n in harmony.notes])
-    all_pitches.extend([n.pitch for n in bass.notes])
-    
-    if all_pitches:
-        ax.set_ylim(min(all_pitches) - 2, max(all_pitches) + 2)
+    # Calculate pitch range from the notes on screen in all voices
+    pitch_range = visible_pitch_range([melody, harmony, bass], max_duration)
+
+    # Plot all voices with different colors, one collection or image per voice
+    handles = []
+    handles.append(draw_notes(
+        ax, melody, max_duration,
+        VOICE_COLORS['melody'], VOICE_EDGE_COLORS['melody'],
+        alpha_range=(0.7, 0.0), pitch_range=pitch_range, label='Melody'
+    ))
+    handles.append(draw_notes(
+        ax, harmony, max_duration,
+        VOICE_COLORS['harmony'], VOICE_EDGE_COLORS['harmony'],
+        alpha_range=(0.6, 0.0), pitch_range=pitch_range, label='Harmony'
+    ))
+    handles.append(draw_notes(
+        ax, bass, max_duration,
+        VOICE_COLORS['bass'], VOICE_EDGE_COLORS['bass'],
+        alpha_range=(0.7, 0.0), pitch_range=pitch_range, label='Bass'
+    ))
+    
+    if pitch_range is not None:
+        ax.set_ylim(pitch_range[0] - 2, pitch_range[1] + 2)
     
     ax.set_xlim(0, max_duration)
     ax.set_xlabel('Time (seconds)', fontsize=12)
     ax.set_ylabel('MIDI Pitch', fontsize=12)
     ax.set_title('Voice Separation (Combined View)', fontsize=14, fontweight='bold')
     ax.grid(True, alpha=0.3)
-    ax.legend(loc='upper right', fontsize=10)
+    handles = [handle for handle in handles if handle is not None]
+    if handles:
+        ax.legend(handles=handles, loc='upper right', fontsize=10)
     
     plt.tight_layout()
     plt.show()
 
 
-def plot_pitch_contours(separator, melody, harmony, bass):
+def _contour(separator, voice, resolution=0.1):
+    """Pitch contour of a voice, reusing the result cached on it"""
+    return voice.cached(
+        f"contour[{resolution}]",
+        lambda: separator.get_voice_contour(voice.notes, resolution=resolution),
+    )
+
+
+def _contour_vertices(times, contour):
+    """
+    Drop the interior points of flat runs in a contour.
+
+    They are collinear with their neighbours, so the line and its fill are
+    drawn exactly the same from far fewer vertices.
+    """
+    keep = np.ones(len(contour), dtype=bool)
+    keep[1:-1] = (contour[1:-1] != contour[:-2]) | (contour[1:-1] != contour[2:])
+    return times[keep], contour[keep]
+
+
+# Figure, contour lines and fills of the last contour plot, for reuse
+_contour_plot = {}
+
+
+def plot_pitch_contours(separator, melody, harmony, bass, reuse=True):
     """
     Plot pitch contours over time for each voice.
+
+    With reuse, a still-open figure from the previous call is updated in
+    place instead of rebuilding its axes.
     """
-    fig, axes = plt.subplots(3, 1, figsize=(14, 9), sharex=True)
-    
+    import matplotlib.pyplot as plt
+
     # Get contours
-    melody_contour = separator.get_voice_contour(melody.notes, resolution=0.1)
-    harmony_contour = separator.get_voice_contour(harmony.notes, resolution=0.1)
-    bass_contour = separator.get_voice_contour(bass.notes, resolution=0.1)
-    
-    time_axis = np.arange(len(melody_contour)) * 0.1
-    
-    # Plot melody contour
-    axes[0].plot(time_axis, melody_contour, 'r-', linewidth=2, label='Melody')
-    axes[0].fill_between(time_axis, melody_contour, alpha=0.3, color='red')
-    axes[0].set_ylabel('Pitch', fontsize=11)
-    axes[0].set_title('Melody Contour', fontweight='bold', color='darkred')
-    axes[0].grid(True, alpha=0.3)
-    
-    # Plot harmony contour
-    axes[1].plot(time_axis[:len(harmony_contour)], harmony_contour, 'b-', linewidth=2, label='Harmony')
-    axes[1].fill_between(time_axis[:len(harmony_contour)], harmony_contour, alpha=0.3, color='blue')
-    axes[1].set_ylabel('Pitch', fontsize=11)
-    axes[1].set_title('Harmony Contour', fontweight='bold', color='darkblue')
-    axes[1].grid(True, alpha=0.3)
-    
-    # Plot bass contour
-    axes[2].plot(time_axis[:len(bass_contour)], bass_contour, 'g-', linewidth=2, label='Bass')
-    axes[2].fill_between(time_axis[:len(bass_contour)], bass_contour, alpha=0.3, color='green')
-    axes[2].set_ylabel('Pitch', fontsize=11)
-    axes[2].set_xlabel('Time (seconds)', fontsize=11)
-    axes[2].set_title('Bass Contour', fontweight='bold', color='darkgreen')
-    axes[2].grid(True, alpha=0.3)
-    
+    voices = {"melody": melody, "harmony": harmony, "bass": bass}
+    contours = [_contour(separator, voice) for voice in voices.values()]
+    # One float32 time axis for the longest contour, sliced for the others
+    time_axis = np.arange(max(map(len, contours)), dtype=np.float32) * np.float32(0.1)
+
+    fig = _contour_plot.get("fig")
+    if not (reuse and fig is not None and plt.fignum_exists(fig.number)):
+        fig, axes = plt.subplots(3, 1, figsize=(14, 9), sharex=True)
+        lines = []
+        for ax, name in zip(axes, voices):
+            line, = ax.plot(
+                [], [], color=VOICE_COLORS[name], linewidth=2, label=name.title()
+            )
+            lines.append(line)
+            ax.set_ylabel('Pitch', fontsize=11)
+            ax.set_title(
+                f'{name.title()} Contour', fontweight='bold',
+                color=VOICE_EDGE_COLORS[name]
+            )
+            ax.grid(True, alpha=0.3)
+        axes[2].set_xlabel('Time (seconds)', fontsize=11)
+        _contour_plot.update(fig=fig, axes=axes, lines=lines, fills=[None] * 3)
+
+    # Lines are updated in place; fill_between has no setter, so only the
+    # fills are rebuilt
+    fills = _contour_plot["fills"]
+    for i, (ax, line, name, contour) in enumerate(zip(
+        _contour_plot["axes"], _contour_plot["lines"], voices, contours
+    )):
+        times, contour = _contour_vertices(time_axis[:len(contour)], contour)
+        line.set_data(times, contour)
+        if fills[i] is not None:
+            fills[i].remove()
+        fills[i] = ax.fill_between(times, contour, alpha=0.3, color=VOICE_COLORS[name])
+        ax.relim()
+        ax.autoscale_view()
+
     plt.tight_layout()
     plt.show()
 
-def analyze_voice_separation(midi_path: str, quantize_first: bool = False):
+def analyze_voice_separation(
+    midi_path: str,
+    quantize_first: bool = False,
+    use_cache: bool = False,
+    show: bool = True,
+):
     """
     Load MIDI, separate voices, and analyze.
     
     Args:
         midi_path: Path to MIDI file
         quantize_first: Whether to quantize before separation
+        use_cache: Reuse the parse and separation of earlier runs on the same,
+            unchanged file with the same code and settings, pickled under
+            CACHE_DIR
+        show: Plot the voices; False skips all visualization
     """
     print(f"\n{'='*70}")
     print(f"Voice Separation Analysis")
@@ -233,26 +328,24 @@ def analyze_voice_separation(midi_path: str, quantize_first: bool = False):
     print(f"File: {Path(midi_path).name}")
     print(f"Quantize First: {quantize_first}")
     
-    # Load MIDI
-    print("\n--- Loading MIDI ---")
-    piano_roll = load_midi(midi_path)
-    
-    # Optional quantization
-    if quantize_first:
-        print("Quantizing timing...")
-        piano_roll = quantize_piano_roll(piano_roll, grid_resolution='16th')
-    
-    # Separate voices
-    print("\n--- Separating Voices ---")
-    separator = VoiceSeparator()
-    melody, harmony, bass = separator.separate_voices(piano_roll)
+    # Load MIDI and separate voices
+    print("\n--- Loading MIDI and Separating Voices ---")
+    if use_cache:
+        path = os.path.abspath(midi_path)
+        st = os.stat(path)
+        piano_roll, (melody, harmony, bass) = _cached_separation(
+            path, st.st_mtime_ns, st.st_size, quantize_first, _cache_version()
+        )
+    else:
+        piano_roll, (melody, harmony, bass) = _separate(midi_path, quantize_first)
+    separator = VoiceSeparator(SEPARATION_CONFIG)
     
     print(f"✓ Separated into {len(melody.notes)} melody notes, "
           f"{len(harmony.notes)} harmony notes, {len(bass.notes)} bass notes")
     
     # Analyze statistics
     print("\n--- Voice Statistics ---")
-    stats = separator.analyze_voices(piano_roll)
+    stats = separator.summarize(piano_roll, melody, harmony, bass)
     
     print(f"Total Notes: {stats['total_notes']}")
     print(f"\nMelody:")
@@ -275,7 +368,7 @@ def analyze_voice_separation(midi_path: str, quantize_first: bool = False):
     
     # Check for voice crossings
     print("\n--- Voice Crossing Detection ---")
-    crossings = separator.detect_voice_crossings(piano_roll)
+    crossings = stats['crossings']
     if crossings:
         print(f"⚠ Found {len(crossings)} voice crossings (potential separation issues)")
         for crossing in crossings[:5]:  # Show first 5
@@ -293,12 +386,13 @@ def analyze_voice_separation(midi_path: str, quantize_first: bool = False):
         print(f"Bass (first 3): {bass.notes[:3]}")
     
     # Visualizations
-    print("\n--- Generating Visualizations ---")
-    max_dur = min(10, piano_roll.get_duration())
-    
-    visualize_voice_separation(piano_roll, melody, harmony, bass, max_dur)
-    visualize_combined_voices(melody, harmony, bass, max_dur)
-    plot_pitch_contours(separator, melody, harmony, bass)
+    if show:
+        print("\n--- Generating Visualizations ---")
+        max_dur = min(10, piano_roll.get_duration())
+
+        visualize_voice_separation(piano_roll, melody, harmony, bass, max_dur)
+        visualize_combined_voices(melody, harmony, bass, max_dur)
+        plot_pitch_contours(separator, melody, harmony, bass)
     
     return piano_roll, melody, harmony, bass
 
@@ -311,6 +405,10 @@ def main():
     parser.add_argument('midi_file', help='Path to MIDI file')
     parser.add_argument('-q', '--quantize', action='store_true',
                        help='Quantize timing before voice separation')
+    parser.add_argument('--cache', action='store_true',
+                       help='Reuse results cached on disk by earlier runs')
+    parser.add_argument('--no-viz', '--no-plots', dest='no_viz', action='store_true',
+                       help='Skip visualization')
     
     args = parser.parse_args()
     
@@ -320,7 +418,12 @@ def main():
         return 1
     
     try:
-        analyze_voice_separation(args.midi_file, args.quantize)
+        analyze_voice_separation(
+            args.midi_file,
+            args.quantize,
+            use_cache=args.cache,
+            show=not args.no_viz,
+        )
         
         print("\n✅ Voice separation test completed successfully!")
         return 0